@@ -10,6 +10,8 @@ from . import exd_api
 class ExdFileInterface(ABC):
     """Abstract interface for external data file handling."""
 
+    __slots__ = ()
+
     @classmethod
     @abstractmethod
     def create(cls, file_path: str, parameters: str) -> ExdFileInterface:
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Callable
 
 import grpc
+from google.protobuf.internal import api_implementation
 from grpc_health.v1 import health, health_pb2, health_pb2_grpc
 
 from . import ExdFileInterface, ExternalDataReader, FileHandlerRegistry, exd_grpc
@@ -197,12 +198,26 @@ def _create_health_check_server(config: ServerConfig) -> grpc.Server | None:
     return health_check_server
 
 
+def _check_protobuf_implementation() -> None:
+    """Warn if protobuf runs on its pure-Python backend, which makes large responses very slow."""
+    log = logging.getLogger(__name__)
+    implementation = api_implementation.Type()
+    if implementation == "python":
+        log.warning(
+            "protobuf is using the pure-Python implementation. Install a protobuf wheel with the upb backend "
+            "and unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION for faster GetValues responses."
+        )
+    else:
+        log.debug("protobuf implementation: %s", implementation)
+
+
 def serve(server_config: ServerConfig | None = None):
     """Starts the gRPC server and listens for incoming requests."""
 
     config = server_config if server_config is not None else _get_server_config()
     if logging.getLogger().isEnabledFor(logging.DEBUG):
         logging.debug("Server configuration: %s", config)
+    _check_protobuf_implementation()
 
     address = f"{config.bind_address}:{config.port}"
     logging.info(
@@ -3,8 +3,11 @@
 
 from __future__ import annotations
 
+import functools
 import threading
-from typing import Any, Callable, override
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any, override
 
 import numpy as np
 import pandas as pd
@@ -16,6 +19,126 @@ from ods_exd_api_box.utils.time_helper import TimeHelper
 
 from .file_simple_interface import FileSimpleInterface
 
+_NUMPY_TO_ODS: dict[np.dtype, ods.DataTypeEnum] = {
+    np.dtype(np.int8): ods.DataTypeEnum.DT_SHORT,
+    np.dtype(np.uint8): ods.DataTypeEnum.DT_BYTE,
+    np.dtype(np.int16): ods.DataTypeEnum.DT_SHORT,
+    np.dtype(np.uint16): ods.DataTypeEnum.DT_LONG,
+    np.dtype(np.int32): ods.DataTypeEnum.DT_LONG,
+    np.dtype(np.uint32): ods.DataTypeEnum.DT_LONGLONG,
+    np.dtype(np.int64): ods.DataTypeEnum.DT_LONGLONG,
+    np.dtype(np.uint64): ods.DataTypeEnum.DT_DOUBLE,
+    np.dtype(np.float32): ods.DataTypeEnum.DT_FLOAT,
+    np.dtype(np.float64): ods.DataTypeEnum.DT_DOUBLE,
+    np.dtype(np.complex64): ods.DataTypeEnum.DT_COMPLEX,
+    np.dtype(np.complex128): ods.DataTypeEnum.DT_DCOMPLEX,
+}
+
+
+def _write_byte(channel_slice: pd.Series, values: ods.DataMatrix.Column.UnknownArray) -> None:
+    values.byte_array.values = np.ascontiguousarray(channel_slice.to_numpy(dtype=np.uint8)).tobytes()
+
+
+def _write_long(channel_slice: pd.Series, values: ods.DataMatrix.Column.UnknownArray) -> None:
+    # to_numpy with an integer dtype raises for missing values of nullable columns instead of casting NaN
+    values.long_array.values.extend(channel_slice.to_numpy(dtype=np.int32).tolist())
+
+
+def _write_longlong(channel_slice: pd.Series, values: ods.DataMatrix.Column.UnknownArray) -> None:
+    values.longlong_array.values.extend(channel_slice.to_numpy(dtype=np.int64).tolist())
+
+
+def _write_float(channel_slice: pd.Series, values: ods.DataMatrix.Column.UnknownArray) -> None:
+    values.float_array.values.extend(np.asarray(channel_slice.to_numpy(copy=False), dtype=np.float32).tolist())
+
+
+def _write_double(channel_slice: pd.Series, values: ods.DataMatrix.Column.UnknownArray) -> None:
+    values.double_array.values.extend(np.asarray(channel_slice.to_numpy(copy=False), dtype=np.float64).tolist())
+
+
+def _write_date(channel_slice: pd.Series, values: ods.DataMatrix.Column.UnknownArray) -> None:
+    if channel_slice.dt.tz is not None:
+        # keep the wall clock time like the conversion of single datetime values
+        channel_slice = channel_slice.dt.tz_localize(None)
+    values.string_array.values.extend(TimeHelper.to_asam_ods_time_array(channel_slice.to_numpy(copy=False)))
+
+
+def _write_string(channel_slice: pd.Series, values: ods.DataMatrix.Column.UnknownArray) -> None:
+    values.string_array.values.extend(channel_slice.tolist())
+
+
+def _write_complex(channel_slice: pd.Series, values: ods.DataMatrix.Column.UnknownArray) -> None:
+    # complex buffer is already interleaved [real1, imag1, real2, imag2, ...]
+    complex_array = np.ascontiguousarray(channel_slice.to_numpy(copy=False), dtype=np.complex64)
+    values.float_array.values.extend(complex_array.view(np.float32).tolist())
+
+
+def _write_dcomplex(channel_slice: pd.Series, values: ods.DataMatrix.Column.UnknownArray) -> None:
+    complex_array = np.ascontiguousarray(channel_slice.to_numpy(copy=False), dtype=np.complex128)
+    values.double_array.values.extend(complex_array.view(np.float64).tolist())
+
+
+_CHANNEL_WRITERS: dict[ods.DataTypeEnum, Callable[[pd.Series, ods.DataMatrix.Column.UnknownArray], None]] = {
+    ods.DataTypeEnum.DT_BYTE: _write_byte,
+    ods.DataTypeEnum.DT_SHORT: _write_long,
+    ods.DataTypeEnum.DT_LONG: _write_long,
+    ods.DataTypeEnum.DT_LONGLONG: _write_longlong,
+    ods.DataTypeEnum.DT_FLOAT: _write_float,
+    ods.DataTypeEnum.DT_DOUBLE: _write_double,
+    ods.DataTypeEnum.DT_DATE: _write_date,
+    ods.DataTypeEnum.DT_STRING: _write_string,
+    ods.DataTypeEnum.DT_COMPLEX: _write_complex,
+    ods.DataTypeEnum.DT_DCOMPLEX: _write_dcomplex,
+}
+
+# Requests with at most this many rows convert numeric channels as one 2D block per target dtype
+_BLOCK_ROW_LIMIT = 1024
+_BLOCK_TARGETS: dict[ods.DataTypeEnum, tuple[type[np.generic], str]] = {
+    ods.DataTypeEnum.DT_SHORT: (np.int32, "long_array"),
+    ods.DataTypeEnum.DT_LONG: (np.int32, "long_array"),
+    ods.DataTypeEnum.DT_LONGLONG: (np.int64, "longlong_array"),
+    ods.DataTypeEnum.DT_FLOAT: (np.float32, "float_array"),
+    ods.DataTypeEnum.DT_DOUBLE: (np.float64, "double_array"),
+}
+
+
+def _block_values(columns: pd.DataFrame, data_types: list[ods.DataTypeEnum]) -> dict[int, list[Any]]:
+    """Convert numeric columns sharing a target dtype in a single step.
+
+    For many channels with few rows the per channel conversion overhead dominates,
+    so all columns with the same target dtype are cast and converted to lists together.
+
+    Returns:
+        Values per column position for all converted columns.
+    """
+    positions_by_dtype: dict[type[np.generic], list[int]] = {}
+    for position, data_type in enumerate(data_types):
+        target = _BLOCK_TARGETS.get(data_type)
+        if target is not None:
+            positions_by_dtype.setdefault(target[0], []).append(position)
+
+    rv: dict[int, list[Any]] = {}
+    for dtype, positions in positions_by_dtype.items():
+        if len(positions) > 1:
+            block = columns.iloc[:, positions].to_numpy(dtype=dtype)
+            rv.update(zip(positions, block.T.tolist()))
+    return rv
+
+
+@dataclass(frozen=True)
+class FileSimpleStructure:
+    """Structure information of a FileSimple file collected under a single lock."""
+
+    file_attributes: dict[str, Any]
+    group_attributes: dict[str, Any]
+    column_names: list[str]
+    column_datatypes: list[ods.DataTypeEnum]
+    column_units: list[str]
+    column_descriptions: list[str]
+    number_of_rows: int
+    number_of_columns: int
+    leading_independent: bool
+
 
 class FileSimpleRegistry:
     """Registry for managing FileSimple implementations."""
@@ -52,36 +175,46 @@ class FileSimpleRegistry:
 
 
 class FileSimpleCache:
+    chunk_size: int = 1_000_000
+
     def __init__(self, file_path: str, parameters: dict[str, Any]):
         self._lock = threading.Lock()
         self._file_path = file_path
         self._parameters: dict[str, Any] = parameters
         self._edp: FileSimpleInterface | None = None
+        self._column_dtypes: pd.Series | None = None
         self._datatypes: list[ods.DataTypeEnum] | None = None
+        self._number_of_rows: int | None = None
+        self._chunks: Iterator[pd.DataFrame] | None = None
+        self._chunk: pd.DataFrame | None = None
+        self._chunk_start: int = 0
 
     def close(self):
         with self._lock:
             if self._edp is not None:
                 self._edp.close()
                 self._edp = None
+                self._column_dtypes = None
                 self._datatypes = None
+                self._number_of_rows = None
+            self._chunks = None
+            self._chunk = None
+            self._chunk_start = 0
 
     def not_my_file(self) -> bool:
         return self._external_data_pandas().not_my_file()
 
     def column_datatype(self, index: int) -> ods.DataTypeEnum:
-        if self._datatypes is None:
-            self._datatypes = self.column_datatypes()
-
-        if index >= len(self._datatypes):
+        datatypes = self.column_datatypes()
+        if index >= len(datatypes):
             raise IndexError(f"Column index {index} out of range!")
-        return self._datatypes[index]
+        return datatypes[index]
 
     def column_data(self, index: int) -> pd.Series:
-        data = self.__data()
-        if index >= data.shape[1]:
+        _, number_of_columns, number_of_rows = self.snapshot()
+        if index >= number_of_columns:
             raise IndexError(f"Column index {index} out of range!")
-        return data.iloc[:, index]
+        return self.read_columns([index], 0, number_of_rows).iloc[:, 0]
 
     def file_attributes(self) -> dict[str, Any]:
         return self._external_data_pandas().file_attributes()
@@ -90,8 +223,8 @@ class FileSimpleCache:
         return self._external_data_pandas().group_attributes()
 
     def column_names(self) -> list[str]:
-        result: list[str] | None = self._external_data_pandas().column_names()
-        return result if result is not None else self.__data().columns.tolist()
+        with self._lock:
+            return self.__column_names()
 
     def column_units(self) -> list[str]:
         return self._external_data_pandas().column_units()
@@ -100,28 +233,164 @@ class FileSimpleCache:
         return self._external_data_pandas().column_descriptions()
 
     def column_datatypes(self) -> list[ods.DataTypeEnum]:
-        return [self._get_datatype(col_type) for col_type in self.__data().dtypes]
+        with self._lock:
+            return self.__datatypes()
+
+    def read_columns(self, indices: list[int], start: int, end: int) -> pd.DataFrame:
+        edp = self._external_data_pandas()
+        if self._reads_chunks(edp):
+            return self.row_range(start, end, indices)
+        return edp.read_columns(indices, start, end)
+
+    def row_range(self, start: int, end: int, indices: list[int]) -> pd.DataFrame:
+        """Collect rows start to end of the given columns from the chunks of the file.
+
+        The current chunk and iterator are kept, so sequential requests continue reading
+        where the previous one stopped instead of starting from the beginning of the file.
+        """
+        with self._lock:
+            if self._chunk is None or start < self._chunk_start:
+                self._chunks = self.__edp().iter_chunks(self.chunk_size)
+                self._chunk_start = 0
+                self._chunk = next(self._chunks, None)
+
+            parts: list[pd.DataFrame] = []
+            while self._chunk is not None and self._chunks is not None:
+                chunk_end = self._chunk_start + self._chunk.shape[0]
+                if chunk_end > start:
+                    parts.append(
+                        self._chunk.iloc[max(start - self._chunk_start, 0) : end - self._chunk_start, indices]
+                    )
+                if chunk_end >= end:
+                    break
+                self._chunk_start = chunk_end
+                self._chunk = next(self._chunks, None)
+
+        if not parts:
+            raise IndexError(f"Row range {start}:{end} out of range!")
+        return parts[0] if 1 == len(parts) else pd.concat(parts)
 
     def number_of_rows(self):
-        return int(self.__data().shape[0])
+        with self._lock:
+            return self.__number_of_rows()
 
     def number_of_columns(self):
-        return int(self.__data().shape[1])
+        return len(self.column_datatypes())
 
     def leading_independent(self) -> bool:
-        column: pd.Series = self.column_data(0)
-        return bool(column.is_monotonic_increasing and column.is_unique)
+        with self._lock:
+            return self.__leading_independent()
 
-    def __data(self) -> pd.DataFrame:
-        return self._external_data_pandas().data()
+    def snapshot(self) -> tuple[list[ods.DataTypeEnum], int, int]:
+        """Return column datatypes, number of columns and number of rows using a single lock.
 
-    def _external_data_pandas(self) -> FileSimpleInterface:
+        Only the structure hooks of the handler are used, the values are not read.
+        """
+        with self._lock:
+            datatypes = self.__datatypes()
+            return datatypes, len(datatypes), self.__number_of_rows()
+
+    def structure_snapshot(self) -> FileSimpleStructure:
+        """Return all information needed to fill the structure using a single lock."""
         with self._lock:
-            if self._edp is None:
-                self._edp = FileSimpleRegistry.create(self._file_path, self._parameters)
-            return self._edp
+            edp = self.__edp()
+            datatypes = self.__datatypes()
+            return FileSimpleStructure(
+                file_attributes=edp.file_attributes(),
+                group_attributes=edp.group_attributes(),
+                column_names=self.__column_names(),
+                column_datatypes=datatypes,
+                column_units=edp.column_units(),
+                column_descriptions=edp.column_descriptions(),
+                number_of_rows=self.__number_of_rows(),
+                number_of_columns=len(datatypes),
+                leading_independent=self.__leading_independent(),
+            )
+
+    def __column_dtypes(self) -> pd.Series:
+        # caller must hold self._lock
+        if self._column_dtypes is None:
+            self._column_dtypes = self.__edp().column_dtypes()
+        return self._column_dtypes
+
+    def __column_names(self) -> list[str]:
+        # caller must hold self._lock
+        result: list[str] | None = self.__edp().column_names()
+        return result if result is not None else self.__column_dtypes().index.tolist()
+
+    def __datatypes(self) -> list[ods.DataTypeEnum]:
+        # caller must hold self._lock
+        if self._datatypes is None:
+            self._datatypes = [self._get_datatype(col_type) for col_type in self.__column_dtypes()]
+        return self._datatypes
+
+    def __number_of_rows(self) -> int:
+        # caller must hold self._lock
+        if self._number_of_rows is None:
+            self._number_of_rows = int(self.__edp().number_of_rows())
+        return self._number_of_rows
+
+    def __leading_independent(self) -> bool:
+        # caller must hold self._lock
+        if not self.__column_dtypes().size:
+            return False
+        edp = self.__edp()
+        first_columns: Iterator[pd.Series]
+        if self._reads_chunks(edp):
+            # checked chunk by chunk, so the first column is never held as a whole
+            first_columns = (chunk.iloc[:, 0] for chunk in edp.iter_chunks(self.chunk_size))
+        else:
+            first_columns = iter((edp.read_columns([0], 0, self.__number_of_rows()).iloc[:, 0],))
+        previous_last = None
+        for first_column in first_columns:
+            if first_column.empty:
+                continue
+            if not (first_column.is_monotonic_increasing and first_column.is_unique):
+                return False
+            if previous_last is not None and not previous_last < first_column.iloc[0]:
+                return False
+            previous_last = first_column.iloc[-1]
+        return True
+
+    @staticmethod
+    def _reads_chunks(edp: FileSimpleInterface) -> bool:
+        # chunks are only used if the handler streams them and does not read row windows itself
+        handler_type = type(edp)
+        return (
+            handler_type.iter_chunks is not FileSimpleInterface.iter_chunks
+            and handler_type.read_columns is FileSimpleInterface.read_columns
+        )
+
+    def __edp(self) -> FileSimpleInterface:
+        # caller must hold self._lock
+        if self._edp is None:
+            self._edp = FileSimpleRegistry.create(self._file_path, self._parameters)
+        return self._edp
+
+    def _external_data_pandas(self) -> FileSimpleInterface:
+        # double-checked: the lock is only needed to create the handler once
+        edp = self._edp
+        if edp is None:
+            with self._lock:
+                edp = self.__edp()
+        return edp
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _get_datatype(data_type: np.dtype) -> ods.DataTypeEnum:
+        # Memoized per dtype object: wide frames repeat only a handful of dtypes
+        # Plain numpy dtypes are resolved by lookup
+        result = _NUMPY_TO_ODS.get(data_type)
+        if result is not None:
+            return result
+
+        # Nullable and pyarrow backed extension dtypes expose their numpy equivalent
+        numpy_dtype = getattr(data_type, "numpy_dtype", None)
+        if numpy_dtype is not None:
+            result = _NUMPY_TO_ODS.get(numpy_dtype)
+            if result is not None:
+                return result
 
-    def _get_datatype(self, data_type: np.dtype) -> ods.DataTypeEnum:
         # Handle pandas-specific dtypes first
         if pd.api.types.is_string_dtype(data_type):
             return ods.DataTypeEnum.DT_STRING
@@ -194,23 +463,24 @@ class FileSimple(ExdFileInterface):
         if file.not_my_file():
             raise NotMyFileError
 
-        AttributeHelper.add(structure.attributes, file.file_attributes())
+        file_structure = file.structure_snapshot()
+        AttributeHelper.add(structure.attributes, file_structure.file_attributes)
 
-        number_of_columns = file.number_of_columns()
-        channel_names = file.column_names()
-        channel_datatypes = file.column_datatypes()
-        channel_units = file.column_units()
-        channel_descriptions = file.column_descriptions()
+        number_of_columns = file_structure.number_of_columns
+        channel_names = file_structure.column_names
+        channel_datatypes = file_structure.column_datatypes
+        channel_units = file_structure.column_units
+        channel_descriptions = file_structure.column_descriptions
 
         # Ensure all arrays have exactly number_of_columns entries
         channel_units = (channel_units + [""] * number_of_columns)[:number_of_columns]
         channel_descriptions = (channel_descriptions + [""] * number_of_columns)[:number_of_columns]
 
         new_group = exd_api.StructureResult.Group(
-            name="data", id=0, total_number_of_channels=number_of_columns, number_of_rows=file.number_of_rows()
+            name="data", id=0, total_number_of_channels=number_of_columns, number_of_rows=file_structure.number_of_rows
         )
 
-        AttributeHelper.add(new_group.attributes, file.group_attributes())
+        AttributeHelper.add(new_group.attributes, file_structure.group_attributes)
 
         for index, (channel_name, channel_datatype, channel_unit, channel_description) in enumerate(
             zip(channel_names, channel_datatypes, channel_units, channel_descriptions), start=0
@@ -221,7 +491,7 @@ class FileSimple(ExdFileInterface):
                 data_type=channel_datatype,
                 unit_string=channel_unit,
             )
-            if 0 == index and file.leading_independent():
+            if 0 == index and file_structure.leading_independent:
                 AttributeHelper.add(new_channel.attributes, {"independent": 1})
             if channel_description:
                 AttributeHelper.add(new_channel.attributes, {"description": channel_description})
@@ -238,64 +508,50 @@ class FileSimple(ExdFileInterface):
         if request.group_id != 0:
             raise ValueError(f"Invalid group id {request.group_id}!")
 
-        nr_of_rows = file.number_of_rows()
-        if request.start >= nr_of_rows:
-            raise ValueError(f"Channel start index {request.start} out of range!")
+        column_data_types, nr_of_columns, nr_of_rows = file.snapshot()
+        start_index = request.start
+        if start_index >= nr_of_rows:
+            raise ValueError(f"Channel start index {start_index} out of range!")
 
-        end_index = request.start + request.limit
+        end_index = start_index + request.limit
         if end_index >= nr_of_rows:
             end_index = nr_of_rows
 
-        rv = exd_api.ValuesResult(id=request.group_id)
-        for channel_index in request.channel_ids:
-            if channel_index >= file.number_of_columns():
+        channel_ids = list(request.channel_ids)
+        for channel_index in channel_ids:
+            if channel_index >= nr_of_columns:
                 raise ValueError(f"Invalid channel id {channel_index}!")
 
-            column_data_type = file.column_datatype(channel_index)
-            channel = file.column_data(channel_index)
-            channel_slice = channel.iloc[request.start : end_index]
+        columns = file.read_columns(channel_ids, start_index, end_index)
 
-            new_channel_values = exd_api.ValuesResult.ChannelValues(
-                id=channel_index,
-            )
-            new_channel_values.values.data_type = column_data_type
-            if ods.DataTypeEnum.DT_BYTE == column_data_type:
-                new_channel_values.values.byte_array.values = channel_slice.to_numpy().tobytes()
-            elif ods.DataTypeEnum.DT_SHORT == column_data_type:
-                new_channel_values.values.long_array.values[:] = channel_slice.to_numpy()
-            elif ods.DataTypeEnum.DT_LONG == column_data_type:
-                new_channel_values.values.long_array.values[:] = channel_slice.to_numpy()
-            elif ods.DataTypeEnum.DT_LONGLONG == column_data_type:
-                new_channel_values.values.longlong_array.values[:] = channel_slice.to_numpy()
-            elif ods.DataTypeEnum.DT_FLOAT == column_data_type:
-                new_channel_values.values.float_array.values[:] = channel_slice.to_numpy()
-            elif ods.DataTypeEnum.DT_DOUBLE == column_data_type:
-                new_channel_values.values.double_array.values[:] = channel_slice.to_numpy()
-            elif ods.DataTypeEnum.DT_DATE == column_data_type:
-                string_values = []
-                for datetime_value in channel_slice:
-                    string_values.append(TimeHelper.to_asam_ods_time(datetime_value))  # type: ignore
-                new_channel_values.values.string_array.values[:] = string_values
-            elif ods.DataTypeEnum.DT_STRING == column_data_type:
-                new_channel_values.values.string_array.values[:] = channel_slice.tolist()
-            elif ods.DataTypeEnum.DT_COMPLEX == column_data_type:
-                complex_array = channel_slice.to_numpy()
-                real_values = []
-                for complex_value in complex_array:
-                    real_values.append(complex_value.real)  # type: ignore
-                    real_values.append(complex_value.imag)  # type: ignore
-                new_channel_values.values.float_array.values[:] = real_values
-            elif ods.DataTypeEnum.DT_DCOMPLEX == column_data_type:
-                complex_array = channel_slice.to_numpy()
-                real_values = []
-                for complex_value in complex_array:
-                    real_values.append(complex_value.real)  # type: ignore
-                    real_values.append(complex_value.imag)  # type: ignore
-                new_channel_values.values.double_array.values[:] = real_values
-            else:
+        if columns.shape[1] != len(channel_ids):
+            raise ValueError(f"Expected {len(channel_ids)} columns, got {columns.shape[1]}!")
+
+        channel_values_type = exd_api.ValuesResult.ChannelValues
+        data_types = [column_data_types[channel_index] for channel_index in channel_ids]
+        block_values = _block_values(columns, data_types) if end_index - start_index <= _BLOCK_ROW_LIMIT else {}
+
+        # items() is cheaper per column than iloc, but creates a Series for every column
+        column_items = columns.items() if not block_values else None
+
+        rv = exd_api.ValuesResult(id=request.group_id)
+        rv_channels = rv.channels
+        for position, (channel_index, column_data_type) in enumerate(zip(channel_ids, data_types)):
+            channel_writer = _CHANNEL_WRITERS.get(column_data_type)
+            if channel_writer is None:
                 raise NotImplementedError(f"Not implemented channel type {column_data_type}!")
 
-            rv.channels.append(new_channel_values)
+            new_channel_values = channel_values_type(id=channel_index)
+            new_channel_values.values.data_type = column_data_type
+            prepared_values = block_values.get(position)
+            if prepared_values is not None:
+                # no Series needed for channels already converted as part of a block
+                getattr(new_channel_values.values, _BLOCK_TARGETS[column_data_type][1]).values.extend(prepared_values)
+            elif column_items is not None:
+                channel_writer(next(column_items)[1], new_channel_values.values)
+            else:
+                channel_writer(columns.iloc[:, position], new_channel_values.values)
+            rv_channels.append(new_channel_values)
 
         return rv
 
@@ -1,6 +1,7 @@
 """Abstract base class for reading external data files using pandas."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
 import pandas as pd
@@ -11,6 +12,8 @@ class FileSimpleInterface(ABC):
     Class to read data from an external file using pandas.
     """
 
+    __slots__ = ()
+
     @classmethod
     @abstractmethod
     def create(cls, file_path: str, parameters: dict[str, Any]) -> "FileSimpleInterface":
@@ -26,9 +29,56 @@ class FileSimpleInterface(ABC):
     def data(self) -> pd.DataFrame:
         """
         Read the data from the file and return it as a pandas DataFrame.
+        Prefer pyarrow backed columns if the reader supports it (e.g. pd.read_csv(..., dtype_backend="pyarrow")),
+        numeric columns without missing values are then handed out without copying.
         :return: DataFrame containing the data from the file.
         """
 
+    def column_dtypes(self) -> pd.Series:
+        """
+        Return the dtypes of the columns without reading the values.
+        Overwrite with read_columns or iter_chunks (e.g. from the file header) so the values are never read as a whole.
+        :return: Series of dtypes indexed by column name, like DataFrame.dtypes.
+        """
+        return self.data().dtypes
+
+    def number_of_rows(self) -> int:
+        """
+        Return the number of rows without reading the values.
+        Overwrite with read_columns or iter_chunks (e.g. from file metadata) so the values are never read as a whole.
+        :return: Number of rows in the file.
+        """
+        return int(self.data().shape[0])
+
+    def read_columns(self, indices: list[int], start: int, end: int) -> pd.DataFrame:
+        """
+        Read a row window of selected columns.
+        Overwrite to push column and row selection down to the file reader.
+        :param indices: Positional column indices in the requested order.
+        :param start: Index of the first row to read.
+        :param end: Index after the last row to read.
+        :return: DataFrame containing one column per entry in indices.
+        """
+        df = self.data()
+        if 0 == start and end >= df.shape[0]:
+            # full column request, skip the row slice and reuse the frame if all columns are requested in order
+            if indices == list(range(df.shape[1])):
+                return df
+            return df.iloc[:, indices]
+        return df.iloc[start:end, indices]
+
+    def iter_chunks(self, chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the data in chunks of rows.
+        Overwrite to stream large files (e.g. pd.read_csv(..., chunksize=chunksize)).
+        If overwritten and read_columns is not, values are collected from the chunks.
+        :param chunksize: Maximal number of rows per chunk.
+        :return: Iterator of DataFrames with consecutive rows.
+        """
+        df = self.data()
+        for offset in range(0, df.shape[0], chunksize):
+            yield df.iloc[offset : offset + chunksize]
+
     def not_my_file(self) -> bool:
         """
         Check if the file should be read with this plugin.
@@ -3,10 +3,10 @@
 # fmt: off
 # isort: skip_file
 
-from .time_helper import TimeHelper
+from .time_helper import TimeHelper, is_datetime_type, to_asam_ods_time
 from .attribute_helper import AttributeHelper
 from .param_parser import ParamParser
 
 # fmt: on
 
-__all__ = ["ParamParser", "AttributeHelper", "TimeHelper"]
+__all__ = ["ParamParser", "AttributeHelper", "TimeHelper", "is_datetime_type", "to_asam_ods_time"]
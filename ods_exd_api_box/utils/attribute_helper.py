@@ -1,13 +1,23 @@
 """Helper functions for adding attributes to ASAM ODS structures."""
 
+from collections.abc import Iterable
+from typing import Any
+
 from ods_exd_api_box.proto import ods
 
-from . import TimeHelper
+from .time_helper import is_datetime_type, to_asam_ods_time
+
+_BOOLEANS, _LONGS, _DOUBLES, _STRINGS = range(4)
+_ARRAY_NAMES = ("boolean_array", "long_array", "double_array", "string_array")
+# Exact type lookup, so bool never ends up in the int bucket.
+_BUCKET_BY_TYPE: dict[type, int] = {bool: _BOOLEANS, int: _LONGS, float: _DOUBLES, str: _STRINGS}
 
 
 class AttributeHelper:
     """Helper class to add attributes to ASAM ODS structures."""
 
+    __slots__ = ()
+
     @staticmethod
     def add(attributes: ods.ContextVariables, properties: dict[str, object]) -> None:
         """
@@ -16,19 +26,60 @@ class AttributeHelper:
         If an attribute value already exists, it is overwritten.
         """
 
-        for name, value in properties.items():
-            if value is None:
-                if name in attributes.variables:
-                    del attributes.variables[name]
-            elif isinstance(value, bool):
-                attributes.variables[name].boolean_array.values.append(value)
-            elif isinstance(value, int):
-                attributes.variables[name].long_array.values.append(value)
-            elif isinstance(value, float):
-                attributes.variables[name].double_array.values.append(value)
-            elif isinstance(value, str):
-                attributes.variables[name].string_array.values.append(value)
-            elif TimeHelper.is_datetime_type(value):
-                attributes.variables[name].string_array.values.append(TimeHelper.to_asam_ods_time(value))
-            else:
-                raise ValueError(f'Attribute "{name}": "{value}" not assignable')
+        AttributeHelper.add_many(attributes, (properties,))
+
+    @staticmethod
+    def add_many(attributes: ods.ContextVariables, rows: Iterable[dict[str, object]]) -> None:
+        """
+        Add the properties of several rows to ASAM ODS ContextVariables.
+        Values of the same name are collected over all rows and written with a single extend per variable,
+        which gives the same result as calling add for each row: None removes the variable and a value of
+        another type replaces the values collected before it.
+        """
+
+        # name -> bucket index and values of the current type
+        entries: dict[str, tuple[int, list[Any]]] = {}
+        # variables removed before the collected values are written
+        reset: set[str] = set()
+
+        for properties in rows:
+            for name, value in properties.items():
+                if value is None:
+                    # Deletion is applied after all values were checked, so an invalid value changes nothing.
+                    reset.add(name)
+                    entries.pop(name, None)
+                    continue
+                index = _BUCKET_BY_TYPE.get(type(value))
+                if index is None:
+                    # datetime values and subclasses of the builtin types take the slow path
+                    index, value = AttributeHelper._classify(name, value)
+                entry = entries.get(name)
+                if entry is not None and entry[0] == index:
+                    entry[1].append(value)
+                    continue
+                if entry is not None:
+                    # the arrays are a oneof, so writing another type drops the previous values
+                    reset.add(name)
+                entries[name] = (index, [value])
+
+        variables = attributes.variables
+        for name in reset:
+            variables.pop(name, None)
+        for name, (index, values) in entries.items():
+            getattr(variables[name], _ARRAY_NAMES[index]).values.extend(values)
+
+    @staticmethod
+    def _classify(name: str, value: object) -> tuple[int, Any]:
+        """Return the bucket index and the value to store for values not matched by their exact type."""
+        # bool must be checked before int because bool is a subclass of int.
+        if isinstance(value, bool):
+            return _BOOLEANS, value
+        if isinstance(value, int):
+            return _LONGS, value
+        if isinstance(value, float):
+            return _DOUBLES, value
+        if isinstance(value, str):
+            return _STRINGS, value
+        if is_datetime_type(value):
+            return _STRINGS, to_asam_ods_time(value)
+        raise ValueError(f'Attribute "{name}": "{value}" not assignable')
@@ -3,16 +3,25 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 import os
 import sys
 from pathlib import Path
 from typing import Any, Callable, Sequence
 
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+
 
 def str2bool(val: Any) -> bool:
     """Convert various string representations to boolean."""
-    return str(val).strip().lower() in {"1", "true", "yes", "on"}
+    return str(val).strip().lower() in _TRUE_VALUES
+
+
+@functools.lru_cache(maxsize=256)
+def _env_var_name(option: str) -> str:
+    """Derive the environment variable name without prefix from a long option (--foo-bar → FOO_BAR)."""
+    return option[2:].replace("-", "_").upper()
 
 
 class EnvArgumentParser(argparse.ArgumentParser):
@@ -46,10 +55,11 @@ class EnvArgumentParser(argparse.ArgumentParser):
         if args is None:
             args = sys.argv[1:]
 
-        dummy_parser = argparse.ArgumentParser(add_help=False)
-        dummy_parser.add_argument("--env-prefix", type=str, default=env_prefix)
-        parser_args, _ = dummy_parser.parse_known_args(args)
-        self._env_prefix = parser_args.env_prefix
+        self._env_prefix = self._scan_env_prefix(args, env_prefix)
+        # snapshot relevant environment once instead of a lookup per argument
+        self._env_snapshot: dict[str, str] = {
+            key: value for key, value in os.environ.items() if key.startswith(self._env_prefix)
+        }
         super().__init__(**kwargs)
         super().add_argument(
             "--env-prefix",
@@ -58,6 +68,27 @@ class EnvArgumentParser(argparse.ArgumentParser):
             default=self._env_prefix,
         )
 
+    @staticmethod
+    def _scan_env_prefix(args: Sequence[str], default: str) -> str:
+        """Return the value of --env-prefix from args without building a parser.
+
+        Supports "--env-prefix VALUE" and "--env-prefix=VALUE". The last occurrence wins.
+        """
+        env_prefix = default
+        index = 0
+        while index < len(args):
+            arg = args[index]
+            if arg == "--":
+                break
+            if arg == "--env-prefix":
+                if index + 1 < len(args):
+                    env_prefix = args[index + 1]
+                    index += 1
+            elif arg.startswith("--env-prefix="):
+                env_prefix = arg.split("=", 1)[1]
+            index += 1
+        return env_prefix
+
     def add_env_argument(
         self,
         *args: str,
@@ -84,14 +115,14 @@ class EnvArgumentParser(argparse.ArgumentParser):
         if env_var is None and args:
             for arg in args:
                 if arg.startswith("--"):
-                    env_var = arg[2:].replace("-", "_").upper()
+                    env_var = _env_var_name(arg)
                     break
         full_env_var = f"{self._env_prefix}{env_var}" if env_var else None
 
         # Handle env default value
         action_ = action or kwargs.get("action", None)
         type_ = type or kwargs.get("type", None)
-        env_val = os.environ.get(full_env_var) if full_env_var else None
+        env_val = self._env_snapshot.get(full_env_var) if full_env_var else None
         if full_env_var and env_val is not None:
             # If environment variable is set, the argument shouldn't be required
             if "required" in kwargs and kwargs["required"]:
@@ -6,6 +6,13 @@ import base64
 import json
 import re
 
+_UNICODE_ESCAPE = re.compile(r"\\u([0-9a-fA-F]{4})")
+
+
+def _replace_unicode_escape(match: re.Match[str]) -> str:
+    # four hex digits are always a valid code point below 0x10000
+    return chr(int(match.group(1), 16))
+
 
 class ParamParser:
     @staticmethod
@@ -26,14 +33,19 @@ class ParamParser:
         Raises:
             ValueError: If parameters is not a string or None, or if parsing fails
         """
-        # Check type first
-        if parameters is not None and not isinstance(parameters, str):
+        # Strings pass with a single type check, None and invalid types are sorted out behind it
+        if not isinstance(parameters, str):
+            if parameters is None:
+                return {}
             raise ValueError(f"parameters must be a string or None, got {type(parameters).__name__}")
-
-        # Handle None and empty string
-        if parameters is None or not parameters:
+        if not parameters:
             return {}
 
+        return ParamParser._parse(parameters)
+
+    @staticmethod
+    def _parse(parameters: str) -> dict[str, object]:
+        """Parse a non-empty parameter string, see parse_params."""
         # Step 1: Trim
         trimmed = parameters.strip()
 
@@ -42,7 +54,7 @@ class ParamParser:
             try:
                 encoded = trimmed[4:]  # Remove 'B64:' prefix
                 decoded = base64.b64decode(encoded).decode("utf-8").strip()
-                return ParamParser.parse_params(decoded)
+                return ParamParser._parse(decoded)
             except (ValueError, UnicodeDecodeError) as e:
                 raise ValueError(f"Invalid base64 encoding: {e}")
 
@@ -57,6 +69,14 @@ class ParamParser:
             except json.JSONDecodeError as e:
                 raise ValueError(f"Invalid JSON format: {e.msg}")
 
+        # Fast path: a single key=value pair, B64 and JSON were already ruled out
+        if ";" not in trimmed and "=" in trimmed:
+            key, value = trimmed.split("=", 1)
+            key = key.strip()
+            if not key:
+                raise ValueError("Parameter key cannot be empty")
+            return {key: ParamParser._decode_unicode_escapes(value.strip())}
+
         # Parse as semicolon-separated key=value pairs
         param_dict: dict[str, object] = {}
         if trimmed:  # Only process if not empty
@@ -86,14 +106,7 @@ class ParamParser:
         Returns:
             The string with all \\uXXXX sequences replaced by their Unicode characters
         """
-
-        def replace_unicode(match: re.Match[str]) -> str:
-            hex_str: str = match.group(1)
-            try:
-                code_point = int(hex_str, 16)
-                return chr(code_point)
-            except (ValueError, OverflowError):
-                # If conversion fails, return the original string
-                return match.group(0)
-
-        return re.sub(r"\\u([0-9a-fA-F]{4})", replace_unicode, text)
+        if "\\u" not in text:
+            return text
+        # Invalid or partial sequences do not match the pattern and are preserved as-is
+        return _UNICODE_ESCAPE.sub(_replace_unicode_escape, text)
@@ -3,10 +3,74 @@ Helper functions for time conversions and checks.
 """
 
 import datetime
+import functools
+import math
+import time
 from typing import Any
 
+# Built once so the per-value checks do not resolve the datetime module attributes on every call.
+_DATETIME_TYPES = (datetime.datetime, datetime.date)
+_NUMERIC_TYPES = (int, float)
+# Indexing a table is cheaper than running the integer format machinery for every field.
+_TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
+# numpy stores NaT as the smallest int64 in every datetime64 unit
+_NAT_TICKS = -(2**63)
+
 
 class TimeHelper:
+    __slots__ = ()
+
+    @staticmethod
+    def _format(dt: datetime.datetime, nanoseconds: int) -> str:
+        """Format the date and time fields of dt followed by the fractional nanoseconds without trailing zeros."""
+        prefix = TimeHelper._prefix(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
+        return prefix + TimeHelper._fraction(nanoseconds)
+
+    @staticmethod
+    def _prefix(year: int, month: int, day: int, hour: int, minute: int, second: int) -> str:
+        """Format the fields as YYYYMMDDhhmmss."""
+        if not 0 <= year <= 9999:
+            raise ValueError(f"year {year} is out of range")
+        two = _TWO_DIGITS
+        return f"{two[year // 100]}{two[year % 100]}{two[month]}{two[day]}{two[hour]}{two[minute]}{two[second]}"
+
+    @staticmethod
+    def _format_epoch_ns(ns: int) -> str:
+        """Format nanoseconds since the Unix epoch, with the same year range as the array conversion."""
+        seconds, nanoseconds = divmod(ns, 1_000_000_000)
+        days, seconds = divmod(seconds, 86_400)
+        year, month, day = TimeHelper._civil_from_days(days)
+        prefix = TimeHelper._prefix(year, month, day, seconds // 3_600, seconds // 60 % 60, seconds % 60)
+        return prefix + TimeHelper._fraction(nanoseconds)
+
+    @staticmethod
+    def _civil_from_days(days: int) -> tuple[int, int, int]:
+        """Return year, month and day of the proleptic Gregorian date days after 1970-01-01.
+
+        Howard Hinnant's civil_from_days, the scalar form of the arithmetic in _format_epoch_array.
+        """
+        z = days + 719_468
+        era = z // 146_097
+        doe = z - era * 146_097
+        yoe = (doe - doe // 1_460 + doe // 36_524 - doe // 146_096) // 365
+        doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+        mp = (5 * doy + 2) // 153
+        day = doy - (153 * mp + 2) // 5 + 1
+        month = mp + 3 if mp < 10 else mp - 9
+        return yoe + era * 400 + (month <= 2), month, day
+
+    @staticmethod
+    def _fraction(nanoseconds: int) -> str:
+        """Format fractional nanoseconds without trailing zeros, empty if there is no fraction."""
+        if nanoseconds == 0:
+            return ""
+        # Drop trailing zeros arithmetically instead of formatting all nine digits and stripping them.
+        width = 9
+        while nanoseconds % 10 == 0:
+            nanoseconds //= 10
+            width -= 1
+        return f"{nanoseconds:0{width}d}"
+
     @staticmethod
     def to_asam_ods_time(datetime_value: Any) -> str:
         """Convert datetime value to ASAM ODS time format YYYYMMDDhhmmss[fffffffff] (nanoseconds).
@@ -27,53 +91,149 @@ class TimeHelper:
         Raises:
             ValueError: If value cannot be converted
         """
+        # Repeated timestamps are common in bulk attribute data. The type and tzinfo are part of the key because
+        # values comparing equal across types or time zones (10:00+00:00 == 12:00+02:00) may format differently.
+        tzinfo = getattr(datetime_value, "tzinfo", None)
+        try:
+            return TimeHelper._cached_to_asam_ods_time(type(datetime_value), tzinfo, datetime_value)  # type: ignore[arg-type]
+        except TypeError:
+            # unhashable values like 0-d numpy arrays
+            return TimeHelper._convert(datetime_value)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _cached_to_asam_ods_time(_value_type: type, _tzinfo: Any, datetime_value: Any) -> str:
+        return TimeHelper._convert(datetime_value)
+
+    @staticmethod
+    def _convert(datetime_value: Any) -> str:
         try:
             # Handle numpy datetime64 (check type name to avoid numpy import)
             if hasattr(datetime_value, "dtype"):
                 dtype_str = str(datetime_value.dtype)
                 if "datetime64" in dtype_str:
-                    # Convert numpy datetime64 to ISO string, then parse
-                    iso_str = str(datetime_value)
-                    # Parse format like "2023-01-15T10:30:45.123456789"
-                    dt = datetime.datetime.fromisoformat(iso_str.replace("T", "T"))
-                    # Extract nanoseconds from fractional seconds
-                    if "." in iso_str:
-                        frac_str = iso_str.split(".")[1][:9].ljust(9, "0")
+                    # Use ticks since epoch to avoid an ISO string roundtrip
+                    if dtype_str.endswith(("[ns]", "[ps]", "[fs]", "[as]")):
+                        # sub-microsecond units span less than the nanosecond range, so the cast cannot overflow
+                        unit, nanoseconds_per_tick = "datetime64[ns]", 1
                     else:
-                        frac_str = "000000000"
-                    return dt.strftime("%Y%m%d%H%M%S") + frac_str.rstrip("0")
+                        # coarser units may lie outside 1677-2262, microseconds cover every four digit year
+                        unit, nanoseconds_per_tick = "datetime64[us]", 1000
+                    ticks = int(datetime_value.astype(unit).astype("int64"))
+                    if ticks == _NAT_TICKS:
+                        raise ValueError("NaT is not a valid time")
+                    return TimeHelper._format_epoch_ns(ticks * nanoseconds_per_tick)
 
             # Handle Python datetime objects
             if isinstance(datetime_value, datetime.datetime):
-                ns = datetime_value.microsecond * 1000  # Convert microseconds to nanoseconds
-                frac_str = f"{ns:09d}".rstrip("0")
-                return datetime_value.strftime("%Y%m%d%H%M%S") + frac_str
+                # Convert microseconds to nanoseconds
+                return TimeHelper._format(datetime_value, datetime_value.microsecond * 1000)
 
             if isinstance(datetime_value, datetime.date):
-                return datetime_value.strftime("%Y%m%d") + "000000"
+                return TimeHelper._prefix(datetime_value.year, datetime_value.month, datetime_value.day, 0, 0, 0)
 
             # Handle Unix timestamps (float or int seconds since epoch)
-            if isinstance(datetime_value, (int, float)):
-                dt = datetime.datetime.fromtimestamp(datetime_value, tz=datetime.timezone.utc)
+            if isinstance(datetime_value, _NUMERIC_TYPES):
+                # gmtime avoids building a datetime object just to read its fields
+                tm = time.gmtime(math.floor(datetime_value))
+                prefix = TimeHelper._prefix(tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour, tm.tm_min, tm.tm_sec)
                 # Extract fractional seconds as nanoseconds
-                ns = int((datetime_value % 1) * 1e9)
-                frac_str = f"{ns:09d}".rstrip("0")
-                return dt.strftime("%Y%m%d%H%M%S") + frac_str
+                return prefix + TimeHelper._fraction(int((datetime_value % 1) * 1e9))
 
         except Exception as e:
             raise ValueError(f"Unable to convert {datetime_value} to ASAM ODS time format: {e}")
 
         raise ValueError(f"Unsupported datetime type: {type(datetime_value)}")
 
+    @staticmethod
+    def to_asam_ods_time_array(datetime_values: Any) -> list[str]:
+        """Convert an array of numpy datetime64 values to ASAM ODS time strings.
+
+        The values are converted to int64 ticks in one numpy call and every distinct value is
+        formatted only once, which pays off for timestamps shared by many rows. NaT is returned as empty string.
+
+        Args:
+            datetime_values: numpy array or sequence of datetime64 values
+
+        Returns:
+            List of strings in format YYYYMMDDhhmmss or YYYYMMDDhhmmssN (without trailing zeros)
+
+        Raises:
+            ValueError: If values cannot be converted
+        """
+        import numpy as np
+
+        try:
+            values = np.asarray(datetime_values)
+            if values.dtype.kind != "M":
+                values = np.asarray(datetime_values, dtype="datetime64")
+            # same unit choice as the scalar conversion, coarse units may lie outside the nanosecond range
+            if np.datetime_data(values.dtype)[0] in ("ns", "ps", "fs", "as"):
+                ticks, ticks_per_second = values.astype("datetime64[ns]", copy=False), 1_000_000_000
+            else:
+                ticks, ticks_per_second = values.astype("datetime64[us]", copy=False), 1_000_000
+            uniques, inverse = np.unique(ticks.view("int64").ravel(), return_inverse=True)
+            formatted = TimeHelper._format_epoch_array(uniques, ticks_per_second)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Unable to convert array to ASAM ODS time format: {e}")
+        result: list[str] = formatted[inverse].tolist()
+        return result
+
+    @staticmethod
+    def _format_epoch_array(ticks: Any, ticks_per_second: int) -> Any:
+        """Format an int64 array of ticks since the Unix epoch using integer math on the whole array.
+
+        The digits are written into a fixed width byte buffer. Stripped fraction digits and NaT rows are
+        filled with NUL bytes, which numpy drops when the buffer is read back as strings.
+        """
+        import numpy as np
+
+        nat = ticks == np.iinfo(np.int64).min
+        seconds, fraction = np.divmod(ticks, ticks_per_second)
+        nanoseconds = fraction * (1_000_000_000 // ticks_per_second)
+        days, seconds = np.divmod(seconds, 86_400)
+        hours, seconds = np.divmod(seconds, 3_600)
+        minutes, seconds = np.divmod(seconds, 60)
+
+        # proleptic Gregorian civil date from days since 1970-01-01 (Howard Hinnant's civil_from_days)
+        z = days + 719_468
+        era = z // 146_097
+        doe = z - era * 146_097
+        yoe = (doe - doe // 1_460 + doe // 36_524 - doe // 146_096) // 365
+        doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+        mp = (5 * doy + 2) // 153
+        day = doy - (153 * mp + 2) // 5 + 1
+        month = np.where(mp < 10, mp + 3, mp - 9)
+        year = yoe + era * 400 + (month <= 2)
+        out_of_range = ((year < 0) | (year > 9999)) & ~nat
+        if np.any(out_of_range):
+            raise ValueError(f"year {year[out_of_range][0]} is out of range")
+
+        fields = ((year, 4), (month, 2), (day, 2), (hours, 2), (minutes, 2), (seconds, 2), (nanoseconds, 9))
+        digits = np.empty((len(ticks), 23), dtype=np.uint8)
+        column = 0
+        for values, width in fields:
+            for power in range(width - 1, -1, -1):
+                digits[:, column] = values // 10**power % 10
+                column += 1
+        fraction_digits = digits[:, 14:]
+        significant = fraction_digits != 0
+        # index of the last non zero fraction digit, -1 if there is no fraction
+        last = np.where(significant.any(axis=1), 8 - np.argmax(significant[:, ::-1], axis=1), -1)
+        digits += ord("0")
+        fraction_digits[np.arange(9) > last[:, np.newaxis]] = 0
+        digits[nat] = 0
+        return digits.view("S23").ravel().astype(str)
+
     @staticmethod
     def is_datetime_type(value: Any) -> bool:
         """Check if value is a datetime type without importing numpy."""
         # Python datetime types
-        if isinstance(value, (datetime.datetime, datetime.date)):
+        if isinstance(value, _DATETIME_TYPES):
             return True
 
-        # Unix timestamp (numeric)
-        if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Unix timestamp (numeric) and bool
+        if isinstance(value, _NUMERIC_TYPES):
             return False  # Would be handled as int/float
 
         # numpy datetime64 (check type name to avoid import)
@@ -81,3 +241,8 @@ class TimeHelper:
             return "datetime64" in str(getattr(value, "dtype", ""))
 
         return False
+
+
+# Module level aliases save the class attribute lookup in tight loops.
+to_asam_ods_time = TimeHelper.to_asam_ods_time
+is_datetime_type = TimeHelper.is_datetime_type
@@ -2,17 +2,102 @@
 
 from __future__ import annotations
 
+import array
+import functools
 from typing import override
 
-from google.protobuf.json_format import ParseDict
-
-from ods_exd_api_box import ExdFileInterface, exd_api
-from ods_exd_api_box.utils import AttributeHelper, ParamParser
+from ods_exd_api_box import ExdFileInterface, exd_api, ods
+
+_CHANNEL_NAMES = (
+    "First  Channel",
+    "Second Chan",
+    "Third Chan",
+    "Fourth Chan",
+    "Fifth Chan",
+    "Sixth Chan",
+    "Seventh Cha",
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _channel_template() -> exd_api.StructureResult.Channel:
+    """DT_DOUBLE channel carrying the NI waveform attributes shared by all channels."""
+    channel = exd_api.StructureResult.Channel()
+    channel.data_type = ods.DataTypeEnum.DT_DOUBLE
+    channel.unit_string = "Volts"
+    variables = channel.attributes.variables
+    variables["NI_UnitDescription"].string_array.values.append("Volts")
+    variables["wf_start_time"].string_array.values.append("20161215223521000000")
+    variables["wf_increment"].double_array.values.append(1.9999999999999998e-05)
+    variables["wf_start_offset"].double_array.values.append(0.0)
+    variables["NI_Number_Of_Scales"].long_array.values.append(2)
+    variables["NI_Scale[1]_Scale_Type"].string_array.values.append("Linear")
+    variables["wf_samples"].long_array.values.append(1)
+    variables["NI_Scale[1]_Linear_Y_Intercept"].double_array.values.append(0.0)
+    variables["NI_Scaling_Status"].string_array.values.append("unscaled")
+    variables["NI_ChannelName"].string_array.values.append("")
+    variables["NI_Scale[1]_Linear_Input_Source"].long_array.values.append(0)
+    variables["NI_Scale[1]_Linear_Slope"].double_array.values.append(0.0003051850947599719)
+    variables["unit_string"].string_array.values.append("Volts")
+    return channel
+
+
+def _add_channel(group: exd_api.StructureResult.Group, channel_id: int, channel_name: str) -> None:
+    """Append a copy of the channel template to the group."""
+    group.channels.append(_channel_template())
+    channel = group.channels[-1]
+    channel.id = channel_id
+    channel.name = channel_name
+    channel.attributes.variables["NI_ChannelName"].string_array.values[0] = channel_name
+
+
+@functools.lru_cache(maxsize=1)
+def _structure_blob() -> bytes:
+    """Serialized constant structure, built once and merged into each response."""
+    result = exd_api.StructureResult()
+    result.identifier.url = "file:///workspaces/ods-exd-api-box/data/dummy.exd_api_test"
+    result.name = "dummy.exd_api_test"
+    group = result.groups.add()
+    group.name = "Layer Data"
+    group.total_number_of_channels = len(_CHANNEL_NAMES)
+    group.number_of_rows = 2000
+    for channel_id, channel_name in enumerate(_CHANNEL_NAMES):
+        _add_channel(group, channel_id, channel_name)
+    return result.SerializeToString()
+
+
+_CHANNEL_VALUES = (
+    array.array("d", [-0.18402661214026306, 0.1480147709585864, -0.24506363109225746, -0.29725028229621264]),
+    array.array("d", [1.0303048799096652, 0.6497390667439802, 0.7638782921842098, 0.5508590960417493]),
+)
+_NUMBER_OF_VALUES = len(_CHANNEL_VALUES[0])
+
+
+def _build_values(start: int, end: int) -> exd_api.ValuesResult:
+    """Build a ValuesResult holding rows [start, end) of the stored channels."""
+    # same check and message as FileSimple.get_values
+    if start >= _NUMBER_OF_VALUES:
+        raise ValueError(f"Channel start index {start} out of range!")
+    result = exd_api.ValuesResult()
+    for channel_id, channel_values in enumerate(_CHANNEL_VALUES):
+        channel = result.channels.add()
+        channel.id = channel_id
+        channel.values.data_type = ods.DataTypeEnum.DT_DOUBLE
+        channel.values.double_array.values.extend(channel_values[start:end])
+    return result
+
+
+@functools.lru_cache(maxsize=1)
+def _values_blob() -> bytes:
+    """Serialized full values payload, built once and merged into each full-range response."""
+    return _build_values(0, _NUMBER_OF_VALUES).SerializeToString()
 
 
 class ExternalDataFile(ExdFileInterface):
     """Class for handling for NI tdms files."""
 
+    __slots__ = ("file_path",)
+
     @classmethod
     @override
     def create(cls, file_path: str, parameters: str) -> ExdFileInterface:
@@ -26,8 +111,6 @@ class ExternalDataFile(ExdFileInterface):
 
     def __init__(self, file_path: str, parameters: str):
         """Initialize the external data file handler."""
-        params = ParamParser.parse_params(parameters)
-        params.get("example_param", "default_value")
         self.file_path = file_path
 
     @override
@@ -44,243 +127,21 @@ class ExternalDataFile(ExdFileInterface):
 
             raise NotMyFileError(f"File '{self.file_path}' is not handled by ExternalDataFile.")
 
+        from ods_exd_api_box.utils import AttributeHelper
+
         AttributeHelper.add(properties={"name": "Raw Layer_00001"}, attributes=structure.attributes)
 
-        hardcoded = exd_api.StructureResult()
-        ParseDict(
-            {
-                "identifier": {"url": "file:///workspaces/ods-exd-api-box/data/dummy.exd_api_test"},
-                "name": "dummy.exd_api_test",
-                "groups": [
-                    {
-                        "name": "Layer Data",
-                        "totalNumberOfChannels": "7",
-                        "numberOfRows": "2000",
-                        "channels": [
-                            {
-                                "name": "First  Channel",
-                                "dataType": "DT_DOUBLE",
-                                "unitString": "Volts",
-                                "attributes": {
-                                    "variables": {
-                                        "NI_UnitDescription": {"stringArray": {"values": ["Volts"]}},
-                                        "wf_start_time": {"stringArray": {"values": ["20161215223521000000"]}},
-                                        "wf_increment": {"doubleArray": {"values": [1.9999999999999998e-05]}},
-                                        "wf_start_offset": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Number_Of_Scales": {"longArray": {"values": [2]}},
-                                        "NI_Scale[1]_Scale_Type": {"stringArray": {"values": ["Linear"]}},
-                                        "wf_samples": {"longArray": {"values": [1]}},
-                                        "NI_Scale[1]_Linear_Y_Intercept": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Scaling_Status": {"stringArray": {"values": ["unscaled"]}},
-                                        "NI_ChannelName": {"stringArray": {"values": ["First  Channel"]}},
-                                        "NI_Scale[1]_Linear_Input_Source": {"longArray": {"values": [0]}},
-                                        "NI_Scale[1]_Linear_Slope": {
-                                            "doubleArray": {"values": [0.0003051850947599719]}
-                                        },
-                                        "unit_string": {"stringArray": {"values": ["Volts"]}},
-                                    }
-                                },
-                            },
-                            {
-                                "id": "1",
-                                "name": "Second Chan",
-                                "dataType": "DT_DOUBLE",
-                                "unitString": "Volts",
-                                "attributes": {
-                                    "variables": {
-                                        "NI_UnitDescription": {"stringArray": {"values": ["Volts"]}},
-                                        "wf_start_time": {"stringArray": {"values": ["20161215223521000000"]}},
-                                        "wf_increment": {"doubleArray": {"values": [1.9999999999999998e-05]}},
-                                        "wf_start_offset": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Number_Of_Scales": {"longArray": {"values": [2]}},
-                                        "NI_Scale[1]_Scale_Type": {"stringArray": {"values": ["Linear"]}},
-                                        "wf_samples": {"longArray": {"values": [1]}},
-                                        "NI_Scale[1]_Linear_Y_Intercept": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Scaling_Status": {"stringArray": {"values": ["unscaled"]}},
-                                        "NI_ChannelName": {"stringArray": {"values": ["Second Chan"]}},
-                                        "NI_Scale[1]_Linear_Input_Source": {"longArray": {"values": [0]}},
-                                        "NI_Scale[1]_Linear_Slope": {
-                                            "doubleArray": {"values": [0.0003051850947599719]}
-                                        },
-                                        "unit_string": {"stringArray": {"values": ["Volts"]}},
-                                    }
-                                },
-                            },
-                            {
-                                "id": "2",
-                                "name": "Third Chan",
-                                "dataType": "DT_DOUBLE",
-                                "unitString": "Volts",
-                                "attributes": {
-                                    "variables": {
-                                        "NI_UnitDescription": {"stringArray": {"values": ["Volts"]}},
-                                        "wf_start_time": {"stringArray": {"values": ["20161215223521000000"]}},
-                                        "wf_increment": {"doubleArray": {"values": [1.9999999999999998e-05]}},
-                                        "wf_start_offset": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Number_Of_Scales": {"longArray": {"values": [2]}},
-                                        "NI_Scale[1]_Scale_Type": {"stringArray": {"values": ["Linear"]}},
-                                        "wf_samples": {"longArray": {"values": [1]}},
-                                        "NI_Scale[1]_Linear_Y_Intercept": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Scaling_Status": {"stringArray": {"values": ["unscaled"]}},
-                                        "NI_ChannelName": {"stringArray": {"values": ["Third Chan"]}},
-                                        "NI_Scale[1]_Linear_Input_Source": {"longArray": {"values": [0]}},
-                                        "NI_Scale[1]_Linear_Slope": {
-                                            "doubleArray": {"values": [0.0003051850947599719]}
-                                        },
-                                        "unit_string": {"stringArray": {"values": ["Volts"]}},
-                                    }
-                                },
-                            },
-                            {
-                                "id": "3",
-                                "name": "Fourth Chan",
-                                "dataType": "DT_DOUBLE",
-                                "unitString": "Volts",
-                                "attributes": {
-                                    "variables": {
-                                        "NI_UnitDescription": {"stringArray": {"values": ["Volts"]}},
-                                        "wf_start_time": {"stringArray": {"values": ["20161215223521000000"]}},
-                                        "wf_increment": {"doubleArray": {"values": [1.9999999999999998e-05]}},
-                                        "wf_start_offset": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Number_Of_Scales": {"longArray": {"values": [2]}},
-                                        "NI_Scale[1]_Scale_Type": {"stringArray": {"values": ["Linear"]}},
-                                        "wf_samples": {"longArray": {"values": [1]}},
-                                        "NI_Scale[1]_Linear_Y_Intercept": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Scaling_Status": {"stringArray": {"values": ["unscaled"]}},
-                                        "NI_ChannelName": {"stringArray": {"values": ["Fourth Chan"]}},
-                                        "NI_Scale[1]_Linear_Input_Source": {"longArray": {"values": [0]}},
-                                        "NI_Scale[1]_Linear_Slope": {
-                                            "doubleArray": {"values": [0.0003051850947599719]}
-                                        },
-                                        "unit_string": {"stringArray": {"values": ["Volts"]}},
-                                    }
-                                },
-                            },
-                            {
-                                "id": "4",
-                                "name": "Fifth Chan",
-                                "dataType": "DT_DOUBLE",
-                                "unitString": "Volts",
-                                "attributes": {
-                                    "variables": {
-                                        "NI_UnitDescription": {"stringArray": {"values": ["Volts"]}},
-                                        "wf_start_time": {"stringArray": {"values": ["20161215223521000000"]}},
-                                        "wf_increment": {"doubleArray": {"values": [1.9999999999999998e-05]}},
-                                        "wf_start_offset": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Number_Of_Scales": {"longArray": {"values": [2]}},
-                                        "NI_Scale[1]_Scale_Type": {"stringArray": {"values": ["Linear"]}},
-                                        "wf_samples": {"longArray": {"values": [1]}},
-                                        "NI_Scale[1]_Linear_Y_Intercept": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Scaling_Status": {"stringArray": {"values": ["unscaled"]}},
-                                        "NI_ChannelName": {"stringArray": {"values": ["Fifth Chan"]}},
-                                        "NI_Scale[1]_Linear_Input_Source": {"longArray": {"values": [0]}},
-                                        "NI_Scale[1]_Linear_Slope": {
-                                            "doubleArray": {"values": [0.0003051850947599719]}
-                                        },
-                                        "unit_string": {"stringArray": {"values": ["Volts"]}},
-                                    }
-                                },
-                            },
-                            {
-                                "id": "5",
-                                "name": "Sixth Chan",
-                                "dataType": "DT_DOUBLE",
-                                "unitString": "Volts",
-                                "attributes": {
-                                    "variables": {
-                                        "NI_UnitDescription": {"stringArray": {"values": ["Volts"]}},
-                                        "wf_start_time": {"stringArray": {"values": ["20161215223521000000"]}},
-                                        "wf_increment": {"doubleArray": {"values": [1.9999999999999998e-05]}},
-                                        "wf_start_offset": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Number_Of_Scales": {"longArray": {"values": [2]}},
-                                        "NI_Scale[1]_Scale_Type": {"stringArray": {"values": ["Linear"]}},
-                                        "wf_samples": {"longArray": {"values": [1]}},
-                                        "NI_Scale[1]_Linear_Y_Intercept": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Scaling_Status": {"stringArray": {"values": ["unscaled"]}},
-                                        "NI_ChannelName": {"stringArray": {"values": ["Sixth Chan"]}},
-                                        "NI_Scale[1]_Linear_Input_Source": {"longArray": {"values": [0]}},
-                                        "NI_Scale[1]_Linear_Slope": {
-                                            "doubleArray": {"values": [0.0003051850947599719]}
-                                        },
-                                        "unit_string": {"stringArray": {"values": ["Volts"]}},
-                                    }
-                                },
-                            },
-                            {
-                                "id": "6",
-                                "name": "Seventh Cha",
-                                "dataType": "DT_DOUBLE",
-                                "unitString": "Volts",
-                                "attributes": {
-                                    "variables": {
-                                        "NI_UnitDescription": {"stringArray": {"values": ["Volts"]}},
-                                        "wf_start_time": {"stringArray": {"values": ["20161215223521000000"]}},
-                                        "wf_increment": {"doubleArray": {"values": [1.9999999999999998e-05]}},
-                                        "wf_start_offset": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Number_Of_Scales": {"longArray": {"values": [2]}},
-                                        "NI_Scale[1]_Scale_Type": {"stringArray": {"values": ["Linear"]}},
-                                        "wf_samples": {"longArray": {"values": [1]}},
-                                        "NI_Scale[1]_Linear_Y_Intercept": {"doubleArray": {"values": [0.0]}},
-                                        "NI_Scaling_Status": {"stringArray": {"values": ["unscaled"]}},
-                                        "NI_ChannelName": {"stringArray": {"values": ["Seventh Cha"]}},
-                                        "NI_Scale[1]_Linear_Input_Source": {"longArray": {"values": [0]}},
-                                        "NI_Scale[1]_Linear_Slope": {
-                                            "doubleArray": {"values": [0.0003051850947599719]}
-                                        },
-                                        "unit_string": {"stringArray": {"values": ["Volts"]}},
-                                    }
-                                },
-                            },
-                        ],
-                    }
-                ],
-                "attributes": {"variables": {"name": {"stringArray": {"values": ["Raw Layer_00001"]}}}},
-            },
-            hardcoded,
-        )
-        structure.MergeFrom(hardcoded)
+        structure.MergeFromString(_structure_blob())
 
     @override
     def get_values(self, request: exd_api.ValuesRequest) -> exd_api.ValuesResult:
         """Get values from the external data file."""
 
-        hardcoded = exd_api.ValuesResult()
-        ParseDict(
-            {
-                "channels": [
-                    {
-                        "values": {
-                            "dataType": "DT_DOUBLE",
-                            "doubleArray": {
-                                "values": [
-                                    -0.18402661214026306,
-                                    0.1480147709585864,
-                                    -0.24506363109225746,
-                                    -0.29725028229621264,
-                                ]
-                            },
-                        }
-                    },
-                    {
-                        "id": "1",
-                        "values": {
-                            "dataType": "DT_DOUBLE",
-                            "doubleArray": {
-                                "values": [
-                                    1.0303048799096652,
-                                    0.6497390667439802,
-                                    0.7638782921842098,
-                                    0.5508590960417493,
-                                ]
-                            },
-                        },
-                    },
-                ]
-            },
-            hardcoded,
-        )
-
-        return hardcoded
+        start = request.start
+        end = min(start + request.limit, _NUMBER_OF_VALUES)
+        if start == 0 and end == _NUMBER_OF_VALUES:
+            return exd_api.ValuesResult.FromString(_values_blob())
+        return _build_values(start, end)
 
 
 if __name__ == "__main__":
@@ -2,19 +2,45 @@
 ExternalFileData class to read data from an external file using pandas.
 """
 
+import importlib.util
 import logging
 from typing import Any, override
 
+import numpy as np
 import pandas as pd
 
 from ods_exd_api_box.simple.file_simple_interface import FileSimpleInterface
 
+# Arrow backed strings are stored as packed buffers instead of one Python object per value
+_STRING_DTYPE = "string[pyarrow]" if importlib.util.find_spec("pyarrow") is not None else "string"
+
+# Column arrays kept as-is (structure of arrays); the DataFrame wraps them without copying
+_TEST_COLUMNS: dict[str, Any] = {
+    "byte_col": np.array([10, 20, 30], dtype=np.uint8),
+    "short_int8": np.array([1, 2, 3], dtype=np.int8),
+    "short_int16": np.array([100, 200, 300], dtype=np.int16),
+    "long_uint16": np.array([1000, 2000, 3000], dtype=np.uint16),
+    "long_int32": np.array([10000, 20000, 30000], dtype=np.int32),
+    "longlong_uint32": np.array([100000, 200000, 300000], dtype=np.uint32),
+    "longlong_int64": np.array([1000000, 2000000, 3000000], dtype=np.int64),
+    "double_uint64": np.array([10000000, 20000000, 30000000], dtype=np.uint64),
+    "float_col": np.array([1.5, 2.5, 3.5], dtype=np.float32),
+    "double_col": np.array([10.123, 20.456, 30.789], dtype=np.float64),
+    "string_col": pd.array(["first", "second", "third"], dtype=_STRING_DTYPE),
+    "date_col": np.array(["2024-01-01", "2024-06-15", "2024-12-31"], dtype="datetime64[ns]"),
+    "complex_col": np.array([1 + 2j, 3 + 4j, 5 + 6j], dtype=np.complex64),
+    "dcomplex_col": np.array([1.1 + 2.2j, 3.3 + 4.4j, 5.5 + 6.6j], dtype=np.complex128),
+}
+_TEST_DF = pd.DataFrame(_TEST_COLUMNS, copy=False)
+
 
 class FileSimpleExample(FileSimpleInterface):
     """
     Concrete implementation for reading CSV files.
     """
 
+    __slots__ = ("df", "file_path", "log", "parameters")
+
     @classmethod
     @override
     def create(cls, file_path: str, parameters: dict[str, Any]) -> FileSimpleInterface:
@@ -50,8 +76,8 @@ class FileSimpleExample(FileSimpleInterface):
         """
         # If the CSV file contains only a single column or all columns have datatype string,
         # we assume that it is not meant to be parsed with this plugin.
-        df = self.data()
-        if df.empty or len(df.columns) == 1 or all(df.dtypes == "object"):
+        number_of_columns, all_object = self._probe_columns()
+        if number_of_columns <= 1 or all_object:
             self.log.info(
                 "File %s is not a valid CSV file for this plugin with parameters '%s'.",
                 self.file_path,
@@ -60,6 +86,17 @@ class FileSimpleExample(FileSimpleInterface):
             return True
         return False
 
+    def _probe_columns(self) -> tuple[int, bool]:
+        """
+        Inspect only the header and first row instead of the full data.
+        For a real CSV file this would be pd.read_csv(self.file_path, nrows=1, **self.parameters).
+        :return: Number of columns (0 if there is no data row) and whether all columns are of object dtype.
+        """
+        head = _TEST_DF.iloc[:1]
+        if head.empty:
+            return 0, False
+        return len(head.columns), all(dtype == "object" for dtype in head.dtypes.values)
+
     @override
     def data(self) -> pd.DataFrame:
         """
@@ -68,26 +105,7 @@ class FileSimpleExample(FileSimpleInterface):
         """
         if self.df is None:
             self.log.info("Reading file: %s", self.file_path)
-            import numpy as np
-
-            self.df = pd.DataFrame(
-                {
-                    "byte_col": np.array([10, 20, 30], dtype=np.uint8),
-                    "short_int8": np.array([1, 2, 3], dtype=np.int8),
-                    "short_int16": np.array([100, 200, 300], dtype=np.int16),
-                    "long_uint16": np.array([1000, 2000, 3000], dtype=np.uint16),
-                    "long_int32": np.array([10000, 20000, 30000], dtype=np.int32),
-                    "longlong_uint32": np.array([100000, 200000, 300000], dtype=np.uint32),
-                    "longlong_int64": np.array([1000000, 2000000, 3000000], dtype=np.int64),
-                    "double_uint64": np.array([10000000, 20000000, 30000000], dtype=np.uint64),
-                    "float_col": np.array([1.5, 2.5, 3.5], dtype=np.float32),
-                    "double_col": np.array([10.123, 20.456, 30.789], dtype=np.float64),
-                    "string_col": pd.Series(["first", "second", "third"], dtype="string"),
-                    "date_col": pd.to_datetime(["2024-01-01", "2024-06-15", "2024-12-31"]),
-                    "complex_col": np.array([1 + 2j, 3 + 4j, 5 + 6j], dtype=np.complex64),
-                    "dcomplex_col": np.array([1.1 + 2.2j, 3.3 + 4.4j, 5.5 + 6.6j], dtype=np.complex128),
-                }
-            )
+            self.df = _TEST_DF.copy(deep=False)
         return self.df
 
 
@@ -1,26 +1,152 @@
 import logging
 import pathlib
 import unittest
+from collections.abc import Iterator
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose
 
 from ods_exd_api_box import ExternalDataReader, FileHandlerRegistry, exd_api, ods
-from ods_exd_api_box.simple.file_simple import FileSimple, FileSimpleRegistry
+from ods_exd_api_box.simple.file_simple import FileSimple, FileSimpleCache, FileSimpleRegistry
 from tests.mock_servicer_context import MockServicerContext
 
-from .file_simple_example import FileSimpleExample
+from .file_simple_example import _TEST_DF, FileSimpleExample
+
+EXPECTED_CHANNELS = (
+    ("byte_col", ods.DataTypeEnum.DT_BYTE),
+    ("short_int8", ods.DataTypeEnum.DT_SHORT),
+    ("short_int16", ods.DataTypeEnum.DT_SHORT),
+    ("long_uint16", ods.DataTypeEnum.DT_LONG),
+    ("long_int32", ods.DataTypeEnum.DT_LONG),
+    ("longlong_uint32", ods.DataTypeEnum.DT_LONGLONG),
+    ("longlong_int64", ods.DataTypeEnum.DT_LONGLONG),
+    ("double_uint64", ods.DataTypeEnum.DT_DOUBLE),
+    ("float_col", ods.DataTypeEnum.DT_FLOAT),
+    ("double_col", ods.DataTypeEnum.DT_DOUBLE),
+    ("string_col", ods.DataTypeEnum.DT_STRING),
+    ("date_col", ods.DataTypeEnum.DT_DATE),
+    ("complex_col", ods.DataTypeEnum.DT_COMPLEX),
+    ("dcomplex_col", ods.DataTypeEnum.DT_DCOMPLEX),
+)
+
+# Channels compared exactly: channel id -> (values array field, expected values)
+EXPECTED_VALUES = {
+    0: ("byte_array", b"\x0a\x14\x1e"),  # 10, 20, 30
+    1: ("long_array", [1, 2, 3]),
+    2: ("long_array", [100, 200, 300]),
+    3: ("long_array", [1000, 2000, 3000]),
+    4: ("long_array", [10000, 20000, 30000]),
+    5: ("longlong_array", [100000, 200000, 300000]),
+    6: ("longlong_array", [1000000, 2000000, 3000000]),
+    7: ("double_array", [10000000, 20000000, 30000000]),
+    10: ("string_array", ["first", "second", "third"]),
+    # Date values are converted to ASAM ODS time format strings
+    11: ("string_array", ["20240101000000", "20240615000000", "20241231000000"]),
+}
+
+# Channels compared within atol=1e-5, complex values are stored as [real1, imag1, real2, imag2, ...]
+EXPECTED_APPROX_VALUES = {
+    8: ("float_array", np.array([1.5, 2.5, 3.5], dtype=np.float32)),
+    9: ("double_array", np.array([10.123, 20.456, 30.789], dtype=np.float64)),
+    12: ("float_array", np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0], dtype=np.float32)),
+    13: ("double_array", np.array([1.1, 2.2, 3.3, 4.4, 5.5, 6.6], dtype=np.float64)),
+}
+
+_ALL_VALUES_REQUEST = exd_api.ValuesRequest(group_id=0, channel_ids=range(len(EXPECTED_CHANNELS)), start=0, limit=3)
+
+
+def all_values_request(handle: exd_api.Handle) -> exd_api.ValuesRequest:
+    """Request all rows of every channel, copied from a prebuilt template."""
+    request = exd_api.ValuesRequest()
+    request.CopyFrom(_ALL_VALUES_REQUEST)
+    request.handle.CopyFrom(handle)
+    return request
+
+
+_DATA_DIR = (pathlib.Path(__file__).parent / ".." / "data").resolve()
+
+
+class FileSimpleChunkedExample(FileSimpleExample):
+    """Example streaming its data in chunks, data() must not be used."""
+
+    chunk_calls = 0
+
+    def data(self) -> pd.DataFrame:
+        raise AssertionError("data() must not be called")
+
+    def column_dtypes(self) -> pd.Series:
+        return _TEST_DF.dtypes
+
+    def number_of_rows(self) -> int:
+        return _TEST_DF.shape[0]
+
+    def iter_chunks(self, chunksize: int) -> Iterator[pd.DataFrame]:
+        FileSimpleChunkedExample.chunk_calls += 1
+        for offset in range(0, _TEST_DF.shape[0], chunksize):
+            yield _TEST_DF.iloc[offset : offset + chunksize]
+
+
+class FileSimpleProjectedExample(FileSimpleExample):
+    """Example reading only the requested columns and rows, data() must not be used."""
+
+    def data(self) -> pd.DataFrame:
+        raise AssertionError("data() must not be called")
+
+    def column_dtypes(self) -> pd.Series:
+        return _TEST_DF.dtypes
+
+    def number_of_rows(self) -> int:
+        return _TEST_DF.shape[0]
+
+    def read_columns(self, indices: list[int], start: int, end: int) -> pd.DataFrame:
+        return _TEST_DF.iloc[start:end, indices]
+
+
+class FileSimpleProjectedChunkedExample(FileSimpleProjectedExample):
+    """Example providing both hooks, read_columns is preferred over the chunks."""
+
+    def iter_chunks(self, chunksize: int) -> Iterator[pd.DataFrame]:
+        raise AssertionError("iter_chunks() must not be called")
+
+
+class FileSimpleNullableExample(FileSimpleExample):
+    """Example with nullable integer columns, the first one containing a missing value."""
+
+    def data(self) -> pd.DataFrame:
+        if self.df is None:
+            self.df = pd.DataFrame(
+                {
+                    "with_na": pd.array([1, None, 3], dtype="Int64"),
+                    "complete": pd.array([4, 5, 6], dtype="Int64"),
+                }
+            )
+        return self.df
 
 
 class TestFileSimpleExample(unittest.TestCase):
     log = logging.getLogger(__name__)
 
-    def setUp(self):
-        """Register ExternalDataFile handler before each test."""
+    @classmethod
+    def setUpClass(cls):
+        """Register the handlers and open the example file once for all tests."""
         FileSimpleRegistry.register(FileSimpleExample.create)
         FileHandlerRegistry.register(file_type_name="test", factory=FileSimple.create)
-        self.context = MockServicerContext()
+        # No test inspects the context state, so one instance serves the whole class
+        cls.context = MockServicerContext()
+        cls.service = ExternalDataReader()
+        cls.handle = cls.service.Open(
+            exd_api.Identifier(url=cls._get_example_file_path("dummy.exd_api_test"), parameters=""), cls.context
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.Close(cls.handle, cls.context)
 
-    def _get_example_file_path(self, file_name: str) -> str:
-        example_file_path = pathlib.Path.joinpath(pathlib.Path(__file__).parent.resolve(), "..", "data", file_name)
-        return pathlib.Path(example_file_path).absolute().resolve().as_uri()
+    @staticmethod
+    def _get_example_file_path(file_name: str) -> str:
+        return (_DATA_DIR / file_name).as_uri()
 
     def test_open(self):
         service = ExternalDataReader()
@@ -33,152 +159,138 @@ class TestFileSimpleExample(unittest.TestCase):
             service.Close(handle, self.context)
 
     def test_structure(self):
-        service = ExternalDataReader()
-        handle = service.Open(
-            exd_api.Identifier(url=self._get_example_file_path("dummy.exd_api_test"), parameters=""), self.context
+        service = self.service
+        handle = self.handle
+        structure = service.GetStructure(exd_api.StructureRequest(handle=handle), self.context)
+
+        self.assertEqual(structure.name, "dummy.exd_api_test")
+        self.assertEqual(len(structure.groups), 1)
+        self.assertEqual(structure.groups[0].number_of_rows, 3)
+        self.assertEqual(len(structure.groups[0].channels), 14)
+        self.assertEqual(structure.groups[0].id, 0)
+
+        # Check all channel names and data types
+        channels = structure.groups[0].channels
+        for channel, expected in zip(channels, EXPECTED_CHANNELS):
+            self.assertEqual((channel.name, channel.data_type), expected)
+
+    def test_get_values(self):
+        service = self.service
+        handle = self.handle
+        # Test all channels in one call
+        values = service.GetValues(all_values_request(handle), self.context)
+        self.assertEqual(values.id, 0)
+        self.assertEqual(len(values.channels), 14)
+
+        for channel_id, (channel, (_, data_type)) in enumerate(zip(values.channels, EXPECTED_CHANNELS)):
+            self.assertEqual((channel.id, channel.values.data_type), (channel_id, data_type))
+        for channel_id, (array_name, expected) in EXPECTED_VALUES.items():
+            self.assertSequenceEqual(getattr(values.channels[channel_id].values, array_name).values, expected)
+
+        for channel_id, (array_name, expected) in EXPECTED_APPROX_VALUES.items():
+            assert_allclose(
+                getattr(values.channels[channel_id].values, array_name).values, expected, rtol=0, atol=1e-5
+            )
+
+    def test_get_values_window(self):
+        service = self.service
+        handle = self.handle
+        values = service.GetValues(
+            exd_api.ValuesRequest(handle=handle, group_id=0, channel_ids=[13, 6, 10], start=1, limit=5),
+            self.context,
         )
+        self.assertEqual(len(values.channels), 3)
+        self.assertEqual(values.channels[0].id, 13)
+        self.assertEqual(len(values.channels[0].values.double_array.values), 4)
+        self.assertAlmostEqual(values.channels[0].values.double_array.values[0], 3.3, places=5)
+        self.assertEqual(values.channels[1].id, 6)
+        self.assertSequenceEqual(values.channels[1].values.longlong_array.values, [2000000, 3000000])
+        self.assertEqual(values.channels[2].id, 10)
+        self.assertSequenceEqual(values.channels[2].values.string_array.values, ["second", "third"])
+
+    def test_row_range_chunked(self):
+        self.enterContext(mock.patch.object(FileSimpleRegistry, "_file_type_factory", FileSimpleChunkedExample.create))
+        FileSimpleChunkedExample.chunk_calls = 0
+        cache = FileSimpleCache("dummy.exd_api_test", {})
+        cache.chunk_size = 2
         try:
-            structure = service.GetStructure(exd_api.StructureRequest(handle=handle), self.context)
-
-            self.assertEqual(structure.name, "dummy.exd_api_test")
-            self.assertEqual(len(structure.groups), 1)
-            self.assertEqual(structure.groups[0].number_of_rows, 3)
-            self.assertEqual(len(structure.groups[0].channels), 14)
-            self.assertEqual(structure.groups[0].id, 0)
-
-            # Check various channel data types
-            channels = structure.groups[0].channels
-            self.assertEqual(channels[0].name, "byte_col")
-            self.assertEqual(channels[0].data_type, ods.DataTypeEnum.DT_BYTE)
-            self.assertEqual(channels[1].name, "short_int8")
-            self.assertEqual(channels[1].data_type, ods.DataTypeEnum.DT_SHORT)
-            self.assertEqual(channels[4].name, "long_int32")
-            self.assertEqual(channels[4].data_type, ods.DataTypeEnum.DT_LONG)
-            self.assertEqual(channels[6].name, "longlong_int64")
-            self.assertEqual(channels[6].data_type, ods.DataTypeEnum.DT_LONGLONG)
-            self.assertEqual(channels[8].name, "float_col")
-            self.assertEqual(channels[8].data_type, ods.DataTypeEnum.DT_FLOAT)
-            self.assertEqual(channels[9].name, "double_col")
-            self.assertEqual(channels[9].data_type, ods.DataTypeEnum.DT_DOUBLE)
-            self.assertEqual(channels[10].name, "string_col")
-            self.assertEqual(channels[10].data_type, ods.DataTypeEnum.DT_STRING)
-            self.assertEqual(channels[11].name, "date_col")
-            self.assertEqual(channels[11].data_type, ods.DataTypeEnum.DT_DATE)
-            self.assertEqual(channels[12].name, "complex_col")
-            self.assertEqual(channels[12].data_type, ods.DataTypeEnum.DT_COMPLEX)
-            self.assertEqual(channels[13].name, "dcomplex_col")
-            self.assertEqual(channels[13].data_type, ods.DataTypeEnum.DT_DCOMPLEX)
+            self.assertSequenceEqual(cache.read_columns([6], 0, 1).iloc[:, 0].tolist(), [1000000])
+            # spans both chunks, continues the running iterator
+            self.assertSequenceEqual(cache.read_columns([6, 10], 1, 3).iloc[:, 1].tolist(), ["second", "third"])
+            self.assertEqual(FileSimpleChunkedExample.chunk_calls, 1)
+            # going backwards restarts the iterator
+            self.assertSequenceEqual(cache.read_columns([0], 0, 3).iloc[:, 0].tolist(), [10, 20, 30])
+            self.assertEqual(FileSimpleChunkedExample.chunk_calls, 2)
+            # the leading independent check streams the chunks as well
+            self.assertTrue(cache.structure_snapshot().leading_independent)
         finally:
-            service.Close(handle, self.context)
+            cache.close()
 
-    def test_get_values(self):
-        service = ExternalDataReader()
-        handle = service.Open(
-            exd_api.Identifier(url=self._get_example_file_path("dummy.exd_api_test"), parameters=""), self.context
+    def test_read_columns_preferred_over_chunks(self):
+        self.enterContext(
+            mock.patch.object(FileSimpleRegistry, "_file_type_factory", FileSimpleProjectedChunkedExample.create)
         )
+        cache = FileSimpleCache("dummy.exd_api_test", {})
         try:
-            # Test all channels in one call
-            values = service.GetValues(
-                exd_api.ValuesRequest(
-                    handle=handle,
-                    group_id=0,
-                    channel_ids=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13],
-                    start=0,
-                    limit=3,
-                ),
-                self.context,
-            )
-            self.assertEqual(values.id, 0)
-            self.assertEqual(len(values.channels), 14)
-
-            # Channel 0: byte_col (DT_BYTE)
-            self.assertEqual(values.channels[0].id, 0)
-            self.assertEqual(values.channels[0].values.data_type, ods.DataTypeEnum.DT_BYTE)
-            self.assertEqual(values.channels[0].values.byte_array.values, b"\x0a\x14\x1e")  # 10, 20, 30
-
-            # Channel 1: short_int8 (DT_SHORT)
-            self.assertEqual(values.channels[1].id, 1)
-            self.assertEqual(values.channels[1].values.data_type, ods.DataTypeEnum.DT_SHORT)
-            self.assertSequenceEqual(values.channels[1].values.long_array.values, [1, 2, 3])
-
-            # Channel 2: short_int16 (DT_SHORT)
-            self.assertEqual(values.channels[2].id, 2)
-            self.assertEqual(values.channels[2].values.data_type, ods.DataTypeEnum.DT_SHORT)
-            self.assertSequenceEqual(values.channels[2].values.long_array.values, [100, 200, 300])
-
-            # Channel 3: long_uint16 (DT_LONG)
-            self.assertEqual(values.channels[3].id, 3)
-            self.assertEqual(values.channels[3].values.data_type, ods.DataTypeEnum.DT_LONG)
-            self.assertSequenceEqual(values.channels[3].values.long_array.values, [1000, 2000, 3000])
-
-            # Channel 4: long_int32 (DT_LONG)
-            self.assertEqual(values.channels[4].id, 4)
-            self.assertEqual(values.channels[4].values.data_type, ods.DataTypeEnum.DT_LONG)
-            self.assertSequenceEqual(values.channels[4].values.long_array.values, [10000, 20000, 30000])
-
-            # Channel 5: longlong_uint32 (DT_LONGLONG)
-            self.assertEqual(values.channels[5].id, 5)
-            self.assertEqual(values.channels[5].values.data_type, ods.DataTypeEnum.DT_LONGLONG)
-            self.assertSequenceEqual(values.channels[5].values.longlong_array.values, [100000, 200000, 300000])
-
-            # Channel 6: longlong_int64 (DT_LONGLONG)
-            self.assertEqual(values.channels[6].id, 6)
-            self.assertEqual(values.channels[6].values.data_type, ods.DataTypeEnum.DT_LONGLONG)
-            self.assertSequenceEqual(values.channels[6].values.longlong_array.values, [1000000, 2000000, 3000000])
-
-            # Channel 7: double_uint64 (DT_DOUBLE)
-            self.assertEqual(values.channels[7].id, 7)
-            self.assertEqual(values.channels[7].values.data_type, ods.DataTypeEnum.DT_DOUBLE)
-            self.assertSequenceEqual(values.channels[7].values.double_array.values, [10000000, 20000000, 30000000])
-
-            # Channel 8: float_col (DT_FLOAT)
-            self.assertEqual(values.channels[8].id, 8)
-            self.assertEqual(values.channels[8].values.data_type, ods.DataTypeEnum.DT_FLOAT)
-            self.assertAlmostEqual(values.channels[8].values.float_array.values[0], 1.5, places=5)
-            self.assertAlmostEqual(values.channels[8].values.float_array.values[1], 2.5, places=5)
-            self.assertAlmostEqual(values.channels[8].values.float_array.values[2], 3.5, places=5)
-
-            # Channel 9: double_col (DT_DOUBLE)
-            self.assertEqual(values.channels[9].id, 9)
-            self.assertEqual(values.channels[9].values.data_type, ods.DataTypeEnum.DT_DOUBLE)
-            self.assertAlmostEqual(values.channels[9].values.double_array.values[0], 10.123, places=5)
-            self.assertAlmostEqual(values.channels[9].values.double_array.values[1], 20.456, places=5)
-            self.assertAlmostEqual(values.channels[9].values.double_array.values[2], 30.789, places=5)
-
-            # Channel 10: string_col (DT_STRING)
-            self.assertEqual(values.channels[10].id, 10)
-            self.assertEqual(values.channels[10].values.data_type, ods.DataTypeEnum.DT_STRING)
-            self.assertSequenceEqual(values.channels[10].values.string_array.values, ["first", "second", "third"])
-
-            # Channel 11: date_col (DT_DATE)
-            self.assertEqual(values.channels[11].id, 11)
-            self.assertEqual(values.channels[11].values.data_type, ods.DataTypeEnum.DT_DATE)
-            self.assertEqual(len(values.channels[11].values.string_array.values), 3)
-            # Date values are converted to ASAM ODS time format strings
-
-            # Channel 12: complex_col (DT_COMPLEX)
-            self.assertEqual(values.channels[12].id, 12)
-            self.assertEqual(values.channels[12].values.data_type, ods.DataTypeEnum.DT_COMPLEX)
-            # Complex values are stored as [real1, imag1, real2, imag2, ...]
-            complex_values = values.channels[12].values.float_array.values
-            self.assertAlmostEqual(complex_values[0], 1.0, places=5)  # real part of 1+2j
-            self.assertAlmostEqual(complex_values[1], 2.0, places=5)  # imag part of 1+2j
-            self.assertAlmostEqual(complex_values[2], 3.0, places=5)  # real part of 3+4j
-            self.assertAlmostEqual(complex_values[3], 4.0, places=5)  # imag part of 3+4j
-            self.assertAlmostEqual(complex_values[4], 5.0, places=5)  # real part of 5+6j
-            self.assertAlmostEqual(complex_values[5], 6.0, places=5)  # imag part of 5+6j
-
-            # Channel 13: dcomplex_col (DT_DCOMPLEX)
-            self.assertEqual(values.channels[13].id, 13)
-            self.assertEqual(values.channels[13].values.data_type, ods.DataTypeEnum.DT_DCOMPLEX)
-            # Double complex values are stored as [real1, imag1, real2, imag2, ...]
-            dcomplex_values = values.channels[13].values.double_array.values
-            self.assertAlmostEqual(dcomplex_values[0], 1.1, places=5)  # real part of 1.1+2.2j
-            self.assertAlmostEqual(dcomplex_values[1], 2.2, places=5)  # imag part of 1.1+2.2j
-            self.assertAlmostEqual(dcomplex_values[2], 3.3, places=5)  # real part of 3.3+4.4j
-            self.assertAlmostEqual(dcomplex_values[3], 4.4, places=5)  # imag part of 3.3+4.4j
-            self.assertAlmostEqual(dcomplex_values[4], 5.5, places=5)  # real part of 5.5+6.6j
-            self.assertAlmostEqual(dcomplex_values[5], 6.6, places=5)  # imag part of 5.5+6.6j
+            self.assertSequenceEqual(cache.read_columns([6], 1, 3).iloc[:, 0].tolist(), [2000000, 3000000])
+            self.assertTrue(cache.structure_snapshot().leading_independent)
+        finally:
+            cache.close()
 
+    def test_extension_dtype_mapping(self):
+        cache = FileSimpleCache("dummy.exd_api_test", {})
+        self.assertEqual(cache._get_datatype(pd.Int64Dtype()), ods.DataTypeEnum.DT_LONGLONG)
+        self.assertEqual(cache._get_datatype(pd.Int16Dtype()), ods.DataTypeEnum.DT_SHORT)
+        self.assertEqual(cache._get_datatype(pd.Float32Dtype()), ods.DataTypeEnum.DT_FLOAT)
+        self.assertEqual(cache._get_datatype(pd.StringDtype()), ods.DataTypeEnum.DT_STRING)
+
+    def test_nullable_integer_with_missing_value(self):
+        with mock.patch.object(FileSimpleRegistry, "_file_type_factory", FileSimpleNullableExample.create):
+            file = FileSimple("nullable.exd_api_test")
+            try:
+                values = file.get_values(exd_api.ValuesRequest(group_id=0, channel_ids=[1], start=0, limit=3))
+                self.assertEqual(values.channels[0].values.data_type, ods.DataTypeEnum.DT_LONGLONG)
+                self.assertSequenceEqual(values.channels[0].values.longlong_array.values, [4, 5, 6])
+                # missing values must not be written as arbitrary integers, neither per channel nor as block
+                for channel_ids in ([0], [0, 1]):
+                    with self.assertRaises(ValueError):
+                        file.get_values(exd_api.ValuesRequest(group_id=0, channel_ids=channel_ids, start=0, limit=3))
+            finally:
+                file.close()
+
+    def test_read_columns_without_data(self):
+        with mock.patch.object(FileSimpleRegistry, "_file_type_factory", FileSimpleProjectedExample.create):
+            file = FileSimple("projected.exd_api_test")
+            try:
+                structure = exd_api.StructureResult()
+                file.fill_structure(structure)
+                self.assertEqual(structure.groups[0].number_of_rows, 3)
+                channels = structure.groups[0].channels
+                self.assertEqual([(channel.name, channel.data_type) for channel in channels], list(EXPECTED_CHANNELS))
+                values = file.get_values(exd_api.ValuesRequest(group_id=0, channel_ids=[6, 10], start=1, limit=5))
+                self.assertSequenceEqual(values.channels[0].values.longlong_array.values, [2000000, 3000000])
+                self.assertSequenceEqual(values.channels[1].values.string_array.values, ["second", "third"])
+            finally:
+                file.close()
+
+    def test_column_access_without_data(self):
+        self.enterContext(
+            mock.patch.object(FileSimpleRegistry, "_file_type_factory", FileSimpleProjectedExample.create)
+        )
+        cache = FileSimpleCache("projected.exd_api_test", {})
+        try:
+            self.assertEqual(cache.column_datatype(6), ods.DataTypeEnum.DT_LONGLONG)
+            self.assertSequenceEqual(cache.column_data(10).tolist(), ["first", "second", "third"])
+            with self.assertRaises(IndexError):
+                cache.column_data(len(EXPECTED_CHANNELS))
         finally:
-            service.Close(handle, self.context)
+            cache.close()
+
+    def test_get_values_block_and_channel_path_equal(self):
+        service = self.service
+        handle = self.handle
+        request = all_values_request(handle)
+        block_values = service.GetValues(request, self.context)
+        with mock.patch("ods_exd_api_box.simple.file_simple._BLOCK_ROW_LIMIT", 0):
+            channel_values = service.GetValues(request, self.context)
+        self.assertEqual(block_values, channel_values)
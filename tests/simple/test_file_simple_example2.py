@@ -8,6 +8,8 @@ from tests.mock_servicer_context import MockServicerContext
 
 from .file_simple_example2 import FileSimpleExample2
 
+_DATA_DIR = (pathlib.Path(__file__).parent / ".." / "data").resolve()
+
 
 class TestFileSimpleExample2(unittest.TestCase):
     log = logging.getLogger(__name__)
@@ -19,8 +21,7 @@ class TestFileSimpleExample2(unittest.TestCase):
         self.context = MockServicerContext()
 
     def _get_example_file_path(self, file_name: str) -> str:
-        example_file_path = pathlib.Path.joinpath(pathlib.Path(__file__).parent.resolve(), "..", "data", file_name)
-        return pathlib.Path(example_file_path).absolute().resolve().as_uri()
+        return (_DATA_DIR / file_name).as_uri()
 
     def test_open(self):
         service = ExternalDataReader()
@@ -3,15 +3,24 @@
 import datetime
 import unittest
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from ods_exd_api_box.proto import ods
-from ods_exd_api_box.utils import AttributeHelper, TimeHelper
+from ods_exd_api_box.utils import AttributeHelper, TimeHelper, is_datetime_type, to_asam_ods_time
 
 
-class TestAttribsHelperTimeConversion(unittest.TestCase):
-    """Test time conversion to ASAM ODS format."""
+class AttribsHelperTestCase(unittest.TestCase):
+    """Base class sharing one helper instance."""
+
+    # AttributeHelper is stateless, one instance serves all tests
+    helper = AttributeHelper()
 
-    def setUp(self):
-        self.helper = AttributeHelper()
+
+class TestAttribsHelperTimeConversion(AttribsHelperTestCase):
+    """Test time conversion to ASAM ODS format."""
 
     def test_python_datetime_with_microseconds(self):
         """Test Python datetime conversion with microseconds."""
@@ -74,6 +83,28 @@ class TestAttribsHelperTimeConversion(unittest.TestCase):
         # 1970-01-01 00:00:00 UTC
         self.assertEqual(result, "19700101000000")
 
+    def test_repeated_values_of_different_types_or_time_zones(self):
+        """Test that cached results are not shared between equal values of different types or time zones."""
+        utc = datetime.datetime(2023, 1, 15, 10, 0, 0, tzinfo=datetime.UTC)
+        cet = datetime.datetime(2023, 1, 15, 12, 0, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+        self.assertEqual(utc, cet)
+        self.assertEqual(TimeHelper.to_asam_ods_time(utc), "20230115100000")
+        self.assertEqual(TimeHelper.to_asam_ods_time(cet), "20230115120000")
+        self.assertEqual(TimeHelper.to_asam_ods_time(datetime.date(2023, 1, 15)), "20230115000000")
+        self.assertEqual(TimeHelper.to_asam_ods_time(1.5), "197001010000015")
+        self.assertEqual(TimeHelper.to_asam_ods_time(1), "19700101000001")
+
+    def test_unix_timestamp_year_out_of_range_raises_error(self):
+        """Test that timestamps outside of the four digit year range raise ValueError."""
+        with self.assertRaisesRegex(ValueError, "out of range"):
+            TimeHelper.to_asam_ods_time(-100_000_000_000)
+
+    def test_module_level_functions(self):
+        """Test that the module level functions match the TimeHelper methods."""
+        dt = datetime.datetime(2023, 1, 15, 10, 30, 45, 123456)
+        self.assertEqual(to_asam_ods_time(dt), TimeHelper.to_asam_ods_time(dt))
+        self.assertTrue(is_datetime_type(dt))
+
     def test_invalid_type_raises_error(self):
         """Test that invalid types raise ValueError."""
         with self.assertRaisesRegex(ValueError, "Unsupported datetime type"):
@@ -109,11 +140,10 @@ class TestAttribsHelperTimeConversion(unittest.TestCase):
         self.assertEqual(result, "20200229120000")
 
 
-class TestAttribsHelperAddAttributes(unittest.TestCase):
+class TestAttribsHelperAddAttributes(AttribsHelperTestCase):
     """Test add method."""
 
     def setUp(self):
-        self.helper = AttributeHelper()
         # Use actual ods.ContextVariables
         self.attributes = ods.ContextVariables()
 
@@ -147,6 +177,15 @@ class TestAttribsHelperAddAttributes(unittest.TestCase):
         self.helper.add(self.attributes, properties)
         self.assertIn(False, self.attributes.variables["enabled"].boolean_array.values)
 
+    def test_add_int_subclass_attribute(self):
+        """Test that subclasses of the builtin types are still assigned by isinstance."""
+
+        class Count(int):
+            pass
+
+        self.helper.add(self.attributes, {"count": Count(7)})
+        self.assertIn(7, self.attributes.variables["count"].long_array.values)
+
     def test_add_datetime_attribute(self):
         """Test adding datetime attribute."""
         dt = datetime.datetime(2023, 1, 15, 10, 30, 45, 123456)
@@ -175,6 +214,14 @@ class TestAttribsHelperAddAttributes(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "not assignable"):
             self.helper.add(self.attributes, properties)
 
+    def test_add_invalid_attribute_leaves_attributes_unchanged(self):
+        """Test that no attribute is written if one of the values is invalid."""
+        properties = {"name": "test", "data": [1, 2, 3]}
+
+        with self.assertRaisesRegex(ValueError, "not assignable"):
+            self.helper.add(self.attributes, properties)
+        self.assertEqual(len(self.attributes.variables), 0)
+
     def test_add_empty_properties(self):
         """Test adding empty properties dict."""
         properties = {}
@@ -217,6 +264,37 @@ class TestAttribsHelperAddAttributes(unittest.TestCase):
         result = TimeHelper.is_datetime_type("2023-01-15")
         self.assertFalse(result)
 
+    def test_add_many_extends_values_per_variable(self):
+        """Test that add_many collects the values of all rows per variable."""
+        rows = [{"name": "a", "count": 1}, {"name": "b", "count": 2}, {"count": 3, "value": 0.5}]
+        self.helper.add_many(self.attributes, rows)
+
+        self.assertEqual(list(self.attributes.variables["name"].string_array.values), ["a", "b"])
+        self.assertEqual(list(self.attributes.variables["count"].long_array.values), [1, 2, 3])
+        self.assertEqual(list(self.attributes.variables["value"].double_array.values), [0.5])
+
+    def test_add_many_none_discards_previous_rows(self):
+        """Test that a None value in a later row drops the values collected before."""
+        self.helper.add(self.attributes, {"obsolete": "old"})
+        self.helper.add_many(self.attributes, [{"obsolete": "a"}, {"obsolete": None}, {"obsolete": "b"}])
+
+        self.assertEqual(list(self.attributes.variables["obsolete"].string_array.values), ["b"])
+
+    def test_add_many_mixed_types_under_one_name(self):
+        """Test that add_many matches calling add for each row when a name changes its type."""
+        rows = [{"mixed": 1}, {"mixed": 2.5}, {"mixed": 3}, {"mixed": 4}, {"other": "x"}, {"other": True}]
+        expected = ods.ContextVariables()
+        self.helper.add(expected, {"mixed": 5, "other": "old"})
+        for row in rows:
+            self.helper.add(expected, row)
+
+        self.helper.add(self.attributes, {"mixed": 5, "other": "old"})
+        self.helper.add_many(self.attributes, rows)
+
+        self.assertEqual(self.attributes, expected)
+        self.assertEqual(list(self.attributes.variables["mixed"].long_array.values), [3, 4])
+        self.assertEqual(list(self.attributes.variables["other"].boolean_array.values), [True])
+
     def test_delete_entry_when_value_is_none(self):
         """Test that attribute is deleted when value is None."""
         self.helper.add(self.attributes, {"val1": 123, "obsolete": "delete me"})
@@ -228,15 +306,71 @@ class TestAttribsHelperAddAttributes(unittest.TestCase):
         self.assertIn("val1", self.attributes.variables)
 
 
-class TestAttribsHelperNumpyDatetime64(unittest.TestCase):
+class TestAttribsHelperNumpyDatetime64(AttribsHelperTestCase):
     """Test numpy datetime64 support (without importing numpy)."""
 
-    def setUp(self):
-        self.helper = AttributeHelper()
-
     def test_numpy_datetime64_like_object(self):
         """Test handling of numpy-like datetime64 objects."""
         # This test documents that numpy datetime64 support exists
         # Actual numpy testing would require numpy to be installed
         # The logic is tested in TimeHelper.is_datetime_type and to_asam_ods_time
         pass
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_datetime64_nanoseconds(self):
+        """Test numpy datetime64 conversion keeps nanoseconds."""
+        dt = np.datetime64("2023-01-15T10:30:45.123456789", "ns")
+        self.assertEqual(TimeHelper.to_asam_ods_time(dt), "20230115103045123456789")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_datetime64_units(self):
+        """Test numpy datetime64 conversion for different units."""
+        self.assertEqual(TimeHelper.to_asam_ods_time(np.datetime64("2023-01-15", "D")), "20230115000000")
+        self.assertEqual(TimeHelper.to_asam_ods_time(np.datetime64("2023-01-15T10:30:45.5", "ms")), "202301151030455")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_datetime64_outside_nanosecond_range(self):
+        """Test numpy datetime64 conversion of coarse units outside the years 1677 to 2262."""
+        self.assertEqual(TimeHelper.to_asam_ods_time(np.datetime64("3000-01-01", "D")), "30000101000000")
+        self.assertEqual(TimeHelper.to_asam_ods_time(np.datetime64("1500-01-01T12:34", "m")), "15000101123400")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_datetime64_before_epoch(self):
+        """Test numpy datetime64 conversion before 1970."""
+        dt = np.datetime64("1969-12-31T23:59:59.25", "ns")
+        self.assertEqual(TimeHelper.to_asam_ods_time(dt), "1969123123595925")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_datetime64_nat(self):
+        """Test numpy datetime64 NaT is rejected for every unit."""
+        for unit in ("ns", "us", "D"):
+            with self.subTest(unit=unit), self.assertRaises(ValueError):
+                TimeHelper.to_asam_ods_time(np.datetime64("NaT", unit))
+        with self.assertRaises(ValueError):
+            self.helper.add(ods.ContextVariables(), {"t": np.datetime64("NaT", "ns")})
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_datetime64_array(self):
+        """Test array conversion with repeated values and NaT."""
+        values = np.array(
+            ["2023-01-15T10:30:45.5", "NaT", "1969-12-31T23:59:59.25", "2023-01-15T10:30:45.5"], dtype="datetime64[ms]"
+        )
+        self.assertEqual(
+            TimeHelper.to_asam_ods_time_array(values),
+            ["202301151030455", "", "1969123123595925", "202301151030455"],
+        )
+        self.assertEqual(TimeHelper.to_asam_ods_time_array(values[:0]), [])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_datetime64_array_outside_nanosecond_range(self):
+        """Test array conversion matches the scalar conversion outside the years 1677 to 2262."""
+        values = np.array(["3000-01-01", "1500-01-01T12:34", "0000-03-01", "-0001-12-31T23:59"], dtype="datetime64[m]")
+        expected = ["30000101000000", "15000101123400", "00000301000000"]
+        self.assertEqual([TimeHelper.to_asam_ods_time(value) for value in values[:3]], expected)
+        self.assertEqual(TimeHelper.to_asam_ods_time_array(values[:3]), expected)
+        for value in (values[3:], np.array(["10000-01-01"], dtype="datetime64[D]")):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    TimeHelper.to_asam_ods_time(value[0])
+                with self.assertRaises(ValueError):
+                    TimeHelper.to_asam_ods_time_array(value)
@@ -4,26 +4,46 @@ from __future__ import annotations
 
 import os
 import unittest
-from argparse import Action
 from pathlib import Path
 
 from ods_exd_api_box.utils.env_argument_parser import EnvArgumentParser, str2bool
 
+_TRUE_STRINGS = ("1", "true", "True", "TRUE", "yes", "Yes", "YES", "on", "On", "ON")
+_FALSE_STRINGS = ("0", "false", "False", "FALSE", "no", "No", "NO", "off", "Off", "OFF", "random")
+_CONFIG_FILE = Path("/tmp/config.ini")
+_CERT_FILE = Path("/path/to/cert.pem")
+_KEY_FILE = Path("/path/to/key.pem")
+
+# Variables with these prefixes might interfere with the tests
+_ENV_PREFIXES = ("ODS_EXD_API_", "TEST_", "CUSTOM_", "ALT_")
+_env_backup: dict[str, str] = {}
+
+
+def setUpModule():
+    """Back up and remove the variables that might interfere, once for all tests."""
+    _env_backup.update((key, value) for key, value in os.environ.items() if key.startswith(_ENV_PREFIXES))
+    for key in _env_backup:
+        del os.environ[key]
+
+
+def tearDownModule():
+    """Restore environment."""
+    # All other variables set by the tests are undone by _EnvTestCase.tearDown
+    os.environ.update(_env_backup)
+
 
 class TestStr2Bool(unittest.TestCase):
     """Test str2bool helper function."""
 
     def test_true_values(self):
         """Test that various representations of true are recognized."""
-        for val in ["1", "true", "True", "TRUE", "yes", "Yes", "YES", "on", "On", "ON"]:
-            with self.subTest(val=val):
-                self.assertTrue(str2bool(val))
+        failed = [val for val in _TRUE_STRINGS if not str2bool(val)]
+        self.assertFalse(failed, f"str2bool returned False for: {failed}")
 
     def test_false_values(self):
         """Test that values not representing true are false."""
-        for val in ["0", "false", "False", "FALSE", "no", "No", "NO", "off", "Off", "OFF", "random"]:
-            with self.subTest(val=val):
-                self.assertFalse(str2bool(val))
+        failed = [val for val in _FALSE_STRINGS if str2bool(val)]
+        self.assertFalse(failed, f"str2bool returned True for: {failed}")
 
     def test_whitespace_handling(self):
         """Test that whitespace is trimmed."""
@@ -38,21 +58,33 @@ class TestStr2Bool(unittest.TestCase):
         self.assertTrue(str2bool(True))
 
 
-class TestEnvArgumentParserBasic(unittest.TestCase):
-    """Test basic EnvArgumentParser functionality."""
+class _EnvTestCase(unittest.TestCase):
+    """Isolate the environment changes of a test.
+
+    Tests set variables with _set_env, which records the previous value so tearDown
+    only undoes the changes of the test.
+    """
 
     def setUp(self):
         """Set up test environment."""
-        # Clear any environment variables that might interfere
-        self.env_backup = os.environ.copy()
-        for key in list(os.environ.keys()):
-            if key.startswith("ODS_EXD_API_") or key.startswith("TEST_"):
-                del os.environ[key]
+        self._env_changes: list[tuple[str, str | None]] = []
 
     def tearDown(self):
-        """Restore environment."""
-        os.environ.clear()
-        os.environ.update(self.env_backup)
+        """Undo the environment changes of the test in reverse order."""
+        for key, previous in reversed(self._env_changes):
+            if previous is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = previous
+
+    def _set_env(self, key: str, value: str) -> None:
+        """Set an environment variable for the duration of the test."""
+        self._env_changes.append((key, os.environ.get(key)))
+        os.environ[key] = value
+
+
+class TestEnvArgumentParserBasic(_EnvTestCase):
+    """Test basic EnvArgumentParser functionality."""
 
     def test_default_env_prefix(self):
         """Test that default env_prefix is ODS_EXD_API_."""
@@ -84,24 +116,12 @@ class TestEnvArgumentParserBasic(unittest.TestCase):
         self.assertEqual(args.foo, "default_value")
 
 
-class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
+class TestEnvArgumentParserEnvironmentVariables(_EnvTestCase):
     """Test environment variable integration."""
 
-    def setUp(self):
-        """Set up test environment."""
-        self.env_backup = os.environ.copy()
-        for key in list(os.environ.keys()):
-            if key.startswith("ODS_EXD_API_") or key.startswith("TEST_") or key.startswith("CUSTOM_"):
-                del os.environ[key]
-
-    def tearDown(self):
-        """Restore environment."""
-        os.environ.clear()
-        os.environ.update(self.env_backup)
-
     def test_string_from_env(self):
         """Test reading string value from environment."""
-        os.environ["ODS_EXD_API_FOO"] = "env_value"
+        self._set_env("ODS_EXD_API_FOO", "env_value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=str)
         args = parser.parse_args([])
@@ -109,7 +129,7 @@ class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
 
     def test_int_from_env(self):
         """Test reading int value from environment."""
-        os.environ["ODS_EXD_API_PORT"] = "8080"
+        self._set_env("ODS_EXD_API_PORT", "8080")
         parser = EnvArgumentParser()
         parser.add_env_argument("--port", type=int)
         args = parser.parse_args([])
@@ -117,7 +137,7 @@ class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
 
     def test_float_from_env(self):
         """Test reading float value from environment."""
-        os.environ["ODS_EXD_API_RATIO"] = "3.14"
+        self._set_env("ODS_EXD_API_RATIO", "3.14")
         parser = EnvArgumentParser()
         parser.add_env_argument("--ratio", type=float)
         args = parser.parse_args([])
@@ -125,15 +145,15 @@ class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
 
     def test_path_from_env(self):
         """Test reading Path value from environment."""
-        os.environ["ODS_EXD_API_CONFIG_FILE"] = "/tmp/config.ini"
+        self._set_env("ODS_EXD_API_CONFIG_FILE", str(_CONFIG_FILE))
         parser = EnvArgumentParser()
         parser.add_env_argument("--config-file", type=Path)
         args = parser.parse_args([])
-        self.assertEqual(args.config_file, Path("/tmp/config.ini"))
+        self.assertEqual(args.config_file, _CONFIG_FILE)
 
     def test_store_true_from_env(self):
         """Test store_true action with environment variable."""
-        os.environ["ODS_EXD_API_VERBOSE"] = "true"
+        self._set_env("ODS_EXD_API_VERBOSE", "true")
         parser = EnvArgumentParser()
         parser.add_env_argument("--verbose", action="store_true")
         args = parser.parse_args([])
@@ -141,7 +161,7 @@ class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
 
     def test_store_true_from_env_false(self):
         """Test store_true action with false environment variable."""
-        os.environ["ODS_EXD_API_VERBOSE"] = "false"
+        self._set_env("ODS_EXD_API_VERBOSE", "false")
         parser = EnvArgumentParser()
         parser.add_env_argument("--verbose", action="store_true")
         args = parser.parse_args([])
@@ -149,7 +169,7 @@ class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
 
     def test_store_false_from_env(self):
         """Test store_false action with environment variable."""
-        os.environ["ODS_EXD_API_NO_COLOR"] = "true"
+        self._set_env("ODS_EXD_API_NO_COLOR", "true")
         parser = EnvArgumentParser()
         parser.add_env_argument("--no-color", action="store_false")
         args = parser.parse_args([])
@@ -157,7 +177,7 @@ class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
 
     def test_cmdline_overrides_env(self):
         """Test that command line arguments override environment variables."""
-        os.environ["ODS_EXD_API_FOO"] = "env_value"
+        self._set_env("ODS_EXD_API_FOO", "env_value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=str)
         args = parser.parse_args(["--foo", "cmdline_value"])
@@ -165,7 +185,7 @@ class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
 
     def test_explicit_default_overridden_by_env(self):
         """Test that environment variable overrides explicit default."""
-        os.environ["ODS_EXD_API_FOO"] = "env_value"
+        self._set_env("ODS_EXD_API_FOO", "env_value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=str, default="default_value")
         args = parser.parse_args([])
@@ -173,7 +193,7 @@ class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
 
     def test_custom_prefix(self):
         """Test custom environment variable prefix."""
-        os.environ["CUSTOM_FOO"] = "custom_value"
+        self._set_env("CUSTOM_FOO", "custom_value")
         parser = EnvArgumentParser(env_prefix="CUSTOM_")
         parser.add_env_argument("--foo", type=str)
         args = parser.parse_args([])
@@ -181,31 +201,19 @@ class TestEnvArgumentParserEnvironmentVariables(unittest.TestCase):
 
     def test_empty_prefix(self):
         """Test empty environment variable prefix."""
-        os.environ["FOO"] = "value"
+        self._set_env("FOO", "value")
         parser = EnvArgumentParser(env_prefix="")
         parser.add_env_argument("--foo", type=str)
         args = parser.parse_args([])
         self.assertEqual(args.foo, "value")
 
 
-class TestEnvArgumentParserCustomEnvVar(unittest.TestCase):
+class TestEnvArgumentParserCustomEnvVar(_EnvTestCase):
     """Test custom environment variable names."""
 
-    def setUp(self):
-        """Set up test environment."""
-        self.env_backup = os.environ.copy()
-        for key in list(os.environ.keys()):
-            if key.startswith("ODS_EXD_API_") or key.startswith("CUSTOM_"):
-                del os.environ[key]
-
-    def tearDown(self):
-        """Restore environment."""
-        os.environ.clear()
-        os.environ.update(self.env_backup)
-
     def test_explicit_env_var(self):
         """Test specifying custom environment variable name."""
-        os.environ["ODS_EXD_API_CUSTOM_NAME"] = "custom_value"
+        self._set_env("ODS_EXD_API_CUSTOM_NAME", "custom_value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=str, env_var="CUSTOM_NAME")
         args = parser.parse_args([])
@@ -213,87 +221,41 @@ class TestEnvArgumentParserCustomEnvVar(unittest.TestCase):
 
     def test_explicit_env_var_with_prefix(self):
         """Test that explicit env_var is still prefixed."""
-        os.environ["ODS_EXD_API_MY_VAR"] = "value"
+        self._set_env("ODS_EXD_API_MY_VAR", "value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=str, env_var="MY_VAR")
         args = parser.parse_args([])
         self.assertEqual(args.foo, "value")
 
 
-class TestEnvArgumentParserHelpText(unittest.TestCase):
+class TestEnvArgumentParserHelpText(_EnvTestCase):
     """Test help text generation."""
 
-    def setUp(self):
-        """Set up test environment."""
-        self.env_backup = os.environ.copy()
-        for key in list(os.environ.keys()):
-            if key.startswith("ODS_EXD_API_"):
-                del os.environ[key]
-
-    def tearDown(self):
-        """Restore environment."""
-        os.environ.clear()
-        os.environ.update(self.env_backup)
-
     def test_help_includes_env_var(self):
         """Test that help text includes environment variable name."""
         parser = EnvArgumentParser()
-        parser.add_env_argument("--foo", type=str, help="Foo parameter")
-        # Get the action
-        action: Action | None = None
-        for act in parser._actions:
-            if "--foo" in act.option_strings:
-                action = act
-                break
-        assert action is not None
-        assert action.help is not None
-        self.assertIn("[env: ODS_EXD_API_FOO]", action.help)
+        action = parser.add_env_argument("--foo", type=str, help="Foo parameter")
+        self.assertEqual(action.help, "Foo parameter [env: ODS_EXD_API_FOO]")
 
     def test_help_without_custom_text(self):
         """Test help text when no custom help is provided."""
         parser = EnvArgumentParser()
-        parser.add_env_argument("--foo", type=str)
-        action: Action | None = None
-        for act in parser._actions:
-            if "--foo" in act.option_strings:
-                action = act
-                break
-        assert action is not None
-        assert action.help is not None
-        self.assertIn("[env: ODS_EXD_API_FOO]", action.help)
+        action = parser.add_env_argument("--foo", type=str)
+        self.assertEqual(action.help, "[env: ODS_EXD_API_FOO]")
 
     def test_help_with_custom_prefix(self):
         """Test help text with custom prefix."""
         parser = EnvArgumentParser(env_prefix="CUSTOM_")
-        parser.add_env_argument("--foo", type=str, help="Foo parameter")
-        action = None
-        for act in parser._actions:
-            if "--foo" in act.option_strings:
-                action = act
-                break
-        assert action is not None
-        assert action.help is not None
-        self.assertIn("[env: CUSTOM_FOO]", action.help)
-
-
-class TestEnvArgumentParserNaming(unittest.TestCase):
-    """Test argument name to environment variable conversion."""
+        action = parser.add_env_argument("--foo", type=str, help="Foo parameter")
+        self.assertEqual(action.help, "Foo parameter [env: CUSTOM_FOO]")
 
-    def setUp(self):
-        """Set up test environment."""
-        self.env_backup = os.environ.copy()
-        for key in list(os.environ.keys()):
-            if key.startswith("ODS_EXD_API_"):
-                del os.environ[key]
 
-    def tearDown(self):
-        """Restore environment."""
-        os.environ.clear()
-        os.environ.update(self.env_backup)
+class TestEnvArgumentParserNaming(_EnvTestCase):
+    """Test argument name to environment variable conversion."""
 
     def test_dash_to_underscore(self):
         """Test that dashes are converted to underscores."""
-        os.environ["ODS_EXD_API_FOO_BAR"] = "value"
+        self._set_env("ODS_EXD_API_FOO_BAR", "value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo-bar", type=str)
         args = parser.parse_args([])
@@ -301,7 +263,7 @@ class TestEnvArgumentParserNaming(unittest.TestCase):
 
     def test_multiple_dashes(self):
         """Test multiple dashes in argument name."""
-        os.environ["ODS_EXD_API_FOO_BAR_BAZ"] = "value"
+        self._set_env("ODS_EXD_API_FOO_BAR_BAZ", "value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo-bar-baz", type=str)
         args = parser.parse_args([])
@@ -309,32 +271,20 @@ class TestEnvArgumentParserNaming(unittest.TestCase):
 
     def test_short_option_ignored(self):
         """Test that short options don't affect env var name."""
-        os.environ["ODS_EXD_API_FOO_BAR"] = "value"
+        self._set_env("ODS_EXD_API_FOO_BAR", "value")
         parser = EnvArgumentParser()
         parser.add_env_argument("-f", "--foo-bar", type=str)
         args = parser.parse_args([])
         self.assertEqual(args.foo_bar, "value")
 
 
-class TestEnvPrefixOption(unittest.TestCase):
+class TestEnvPrefixOption(_EnvTestCase):
     """Test --env-prefix command line option."""
 
-    def setUp(self):
-        """Set up test environment."""
-        self.env_backup = os.environ.copy()
-        for key in list(os.environ.keys()):
-            if key.startswith("ODS_EXD_API_") or key.startswith("ALT_"):
-                del os.environ[key]
-
-    def tearDown(self):
-        """Restore environment."""
-        os.environ.clear()
-        os.environ.update(self.env_backup)
-
     def test_env_prefix_changes_lookup(self):
         """Test that --env-prefix changes environment variable lookup."""
-        os.environ["ALT_FOO"] = "alt_value"
-        os.environ["ODS_EXD_API_FOO"] = "default_value"
+        self._set_env("ALT_FOO", "alt_value")
+        self._set_env("ODS_EXD_API_FOO", "default_value")
         args_list = ["--env-prefix", "ALT_"]
         parser = EnvArgumentParser(args_list)
         parser.add_env_argument("--foo", type=str)
@@ -343,7 +293,7 @@ class TestEnvPrefixOption(unittest.TestCase):
 
     def test_env_prefix_with_equals(self):
         """Test --env-prefix=VALUE syntax."""
-        os.environ["ALT_FOO"] = "alt_value"
+        self._set_env("ALT_FOO", "alt_value")
         args_list = ["--env-prefix=ALT_"]
         parser = EnvArgumentParser(args_list)
         parser.add_env_argument("--foo", type=str)
@@ -352,7 +302,7 @@ class TestEnvPrefixOption(unittest.TestCase):
 
     def test_env_prefix_empty_string(self):
         """Test --env-prefix with empty string."""
-        os.environ["FOO"] = "value"
+        self._set_env("FOO", "value")
         args_list = ["--env-prefix", ""]
         parser = EnvArgumentParser(args_list)
         parser.add_env_argument("--foo", type=str)
@@ -361,8 +311,8 @@ class TestEnvPrefixOption(unittest.TestCase):
 
     def test_env_prefix_not_from_env_var(self):
         """Test that --env-prefix cannot be set via environment variable."""
-        os.environ["ODS_EXD_API_ENV_PREFIX"] = "ALT_"
-        os.environ["ODS_EXD_API_FOO"] = "default_value"
+        self._set_env("ODS_EXD_API_ENV_PREFIX", "ALT_")
+        self._set_env("ODS_EXD_API_FOO", "default_value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=str)
         args = parser.parse_args([])
@@ -371,8 +321,8 @@ class TestEnvPrefixOption(unittest.TestCase):
 
     def test_env_prefix_with_multiple_args(self):
         """Test --env-prefix with multiple arguments."""
-        os.environ["ALT_FOO"] = "foo_value"
-        os.environ["ALT_BAR"] = "bar_value"
+        self._set_env("ALT_FOO", "foo_value")
+        self._set_env("ALT_BAR", "bar_value")
         args = ["--env-prefix", "ALT_"]
         parser = EnvArgumentParser(args)
         parser.add_env_argument("--foo", type=str)
@@ -381,38 +331,48 @@ class TestEnvPrefixOption(unittest.TestCase):
         self.assertEqual(args.foo, "foo_value")
         self.assertEqual(args.bar, "bar_value")
 
+    def test_env_prefix_last_occurrence_wins(self):
+        """Test that the last --env-prefix is used if given multiple times."""
+        parser = EnvArgumentParser(["--env-prefix", "FIRST_", "--env-prefix=ALT_"])
+        self.assertEqual(parser._env_prefix, "ALT_")
+
+    def test_env_prefix_after_double_dash_ignored(self):
+        """Test that --env-prefix after '--' is treated as positional."""
+        parser = EnvArgumentParser(["--", "--env-prefix", "ALT_"])
+        self.assertEqual(parser._env_prefix, "ODS_EXD_API_")
+
+    def test_environment_read_at_construction(self):
+        """Test that the environment is snapshotted when the parser is created."""
+        self._set_env("ALT_FOO", "before")
+        parser = EnvArgumentParser(["--env-prefix", "ALT_"])
+        self._set_env("ALT_FOO", "after")
+        self._set_env("ALT_BAR", "after")
+        parser.add_env_argument("--foo", type=str)
+        parser.add_env_argument("--bar", type=str)
+        args = parser.parse_args(["--env-prefix", "ALT_"])
+        self.assertEqual(args.foo, "before")
+        self.assertIsNone(args.bar)
+
     def test_cmdline_overrides_env_with_custom_prefix(self):
         """Test command line overrides env even with custom prefix."""
-        os.environ["ALT_FOO"] = "env_value"
+        self._set_env("ALT_FOO", "env_value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=str)
         args = parser.parse_args(["--env-prefix", "ALT_", "--foo", "cmdline_value"])
         self.assertEqual(args.foo, "cmdline_value")
 
 
-class TestEnvArgumentParserServerLike(unittest.TestCase):
+class TestEnvArgumentParserServerLike(_EnvTestCase):
     """Test scenarios similar to server.py usage."""
 
-    def setUp(self):
-        """Set up test environment."""
-        self.env_backup = os.environ.copy()
-        for key in list(os.environ.keys()):
-            if key.startswith("ODS_EXD_API_"):
-                del os.environ[key]
-
-    def tearDown(self):
-        """Restore environment."""
-        os.environ.clear()
-        os.environ.update(self.env_backup)
-
     def test_server_config_scenario(self):
         """Test a scenario similar to server.py configuration."""
         # Set up environment variables
-        os.environ["ODS_EXD_API_BIND_ADDRESS"] = "localhost"
-        os.environ["ODS_EXD_API_PORT"] = "9090"
-        os.environ["ODS_EXD_API_MAX_WORKERS"] = "8"
-        os.environ["ODS_EXD_API_USE_TLS"] = "true"
-        os.environ["ODS_EXD_API_VERBOSE"] = "1"
+        self._set_env("ODS_EXD_API_BIND_ADDRESS", "localhost")
+        self._set_env("ODS_EXD_API_PORT", "9090")
+        self._set_env("ODS_EXD_API_MAX_WORKERS", "8")
+        self._set_env("ODS_EXD_API_USE_TLS", "true")
+        self._set_env("ODS_EXD_API_VERBOSE", "1")
 
         parser = EnvArgumentParser(description="ASAM ODS EXD-API gRPC Server")
         parser.add_env_argument("--bind-address", type=str, default="[::]")
@@ -423,16 +383,23 @@ class TestEnvArgumentParserServerLike(unittest.TestCase):
 
         args = parser.parse_args([])
 
-        self.assertEqual(args.bind_address, "localhost")
-        self.assertEqual(args.port, 9090)
-        self.assertEqual(args.max_workers, 8)
-        self.assertTrue(args.use_tls)
-        self.assertTrue(args.verbose)
+        # Compare all options at once so a regression reports every differing value
+        self.assertEqual(
+            vars(args),
+            {
+                "env_prefix": "ODS_EXD_API_",
+                "bind_address": "localhost",
+                "port": 9090,
+                "max_workers": 8,
+                "use_tls": True,
+                "verbose": True,
+            },
+        )
 
     def test_mixed_env_and_cmdline(self):
         """Test mixing environment variables and command line arguments."""
-        os.environ["ODS_EXD_API_PORT"] = "8080"
-        os.environ["ODS_EXD_API_MAX_WORKERS"] = "16"
+        self._set_env("ODS_EXD_API_PORT", "8080")
+        self._set_env("ODS_EXD_API_MAX_WORKERS", "16")
 
         parser = EnvArgumentParser()
         parser.add_env_argument("--bind-address", type=str, default="[::]")
@@ -447,8 +414,8 @@ class TestEnvArgumentParserServerLike(unittest.TestCase):
 
     def test_path_arguments(self):
         """Test Path type arguments."""
-        os.environ["ODS_EXD_API_TLS_CERT_FILE"] = "/path/to/cert.pem"
-        os.environ["ODS_EXD_API_TLS_KEY_FILE"] = "/path/to/key.pem"
+        self._set_env("ODS_EXD_API_TLS_CERT_FILE", str(_CERT_FILE))
+        self._set_env("ODS_EXD_API_TLS_KEY_FILE", str(_KEY_FILE))
 
         parser = EnvArgumentParser()
         parser.add_env_argument("--tls-cert-file", type=Path)
@@ -456,8 +423,8 @@ class TestEnvArgumentParserServerLike(unittest.TestCase):
 
         args = parser.parse_args([])
 
-        self.assertEqual(args.tls_cert_file, Path("/path/to/cert.pem"))
-        self.assertEqual(args.tls_key_file, Path("/path/to/key.pem"))
+        self.assertEqual(args.tls_cert_file, _CERT_FILE)
+        self.assertEqual(args.tls_key_file, _KEY_FILE)
 
     def test_no_env_uses_defaults(self):
         """Test that defaults are used when no environment variables are set."""
@@ -473,56 +440,29 @@ class TestEnvArgumentParserServerLike(unittest.TestCase):
         self.assertFalse(args.verbose)
 
 
-class TestEnvArgumentParserEdgeCases(unittest.TestCase):
+class TestEnvArgumentParserEdgeCases(_EnvTestCase):
     """Test edge cases and error conditions."""
 
-    def setUp(self):
-        """Set up test environment."""
-        self.env_backup = os.environ.copy()
-        for key in list(os.environ.keys()):
-            if key.startswith("ODS_EXD_API_"):
-                del os.environ[key]
-
-    def tearDown(self):
-        """Restore environment."""
-        os.environ.clear()
-        os.environ.update(self.env_backup)
-
-    def test_invalid_type_conversion(self):
-        """Test that invalid type conversion uses raw string."""
-        os.environ["ODS_EXD_API_PORT"] = "not_a_number"
-        parser = EnvArgumentParser()
-        parser.add_env_argument("--port", type=int)
-        args = parser.parse_args(["--port=15"])
-        self.assertEqual(args.port, 15)
-
-    def test_invalid_type_conversion_default(self):
-        """Test that invalid type conversion uses raw string."""
-        os.environ["ODS_EXD_API_PORT"] = "not_a_number"
-        parser = EnvArgumentParser()
-        parser.add_env_argument("--port", type=int, default=17)
-        args = parser.parse_args([])
-        self.assertEqual(args.port, 17)
-
-    def test_invalid_type_conversion_default_env(self):
-        """Test that invalid type conversion uses raw string."""
-        os.environ["ODS_EXD_API_PORT"] = "21"
-        parser = EnvArgumentParser()
-        parser.add_env_argument("--port", type=int, default=17)
-        args = parser.parse_args([])
-        self.assertEqual(args.port, 21)
-
-    def test_invalid_type_conversion_default_env_param(self):
-        """Test that invalid type conversion uses raw string."""
-        os.environ["ODS_EXD_API_PORT"] = "21"
-        parser = EnvArgumentParser()
-        parser.add_env_argument("--port", type=int, default=17)
-        args = parser.parse_args(["--port=42"])
-        self.assertEqual(args.port, 42)
+    def test_port_resolution(self):
+        """Test command line, environment and default precedence, including invalid environment values."""
+        # env value, default, command line, expected
+        cases = (
+            ("not_a_number", None, ["--port=15"], 15),
+            ("not_a_number", 17, [], 17),
+            ("21", 17, [], 21),
+            ("21", 17, ["--port=42"], 42),
+        )
+        for env_value, default, cmdline, expected in cases:
+            with self.subTest(env_value=env_value, default=default, cmdline=cmdline):
+                self._set_env("ODS_EXD_API_PORT", env_value)
+                parser = EnvArgumentParser()
+                parser.add_env_argument("--port", type=int, default=default)
+                args = parser.parse_args(cmdline)
+                self.assertEqual(args.port, expected)
 
     def test_type_conversion_fallback(self):
         """Test fallback for type conversion failures in add_env_argument."""
-        os.environ["ODS_EXD_API_FOO"] = "notanumber"
+        self._set_env("ODS_EXD_API_FOO", "notanumber")
 
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=int)
@@ -546,7 +486,7 @@ class TestEnvArgumentParserEdgeCases(unittest.TestCase):
 
     def test_required_argument_satisfied_by_env(self):
         """Test required argument satisfied by environment variable."""
-        os.environ["ODS_EXD_API_FOO"] = "value"
+        self._set_env("ODS_EXD_API_FOO", "value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=str, required=True)
         args = parser.parse_args([])
@@ -554,7 +494,7 @@ class TestEnvArgumentParserEdgeCases(unittest.TestCase):
 
     def test_env_prefix_position_in_args(self):
         """Test --env-prefix can appear anywhere in arguments."""
-        os.environ["ALT_FOO"] = "alt_value"
+        self._set_env("ALT_FOO", "alt_value")
         parser = EnvArgumentParser()
         parser.add_env_argument("--foo", type=str)
         parser.add_env_argument("--bar", type=str, default="default")
@@ -566,7 +506,7 @@ class TestEnvArgumentParserEdgeCases(unittest.TestCase):
 
     def test_env_prefix_position_in_args_global(self):
         """Test --env-prefix can appear anywhere in arguments."""
-        os.environ["ALT_FOO"] = "alt_value"
+        self._set_env("ALT_FOO", "alt_value")
         parser = EnvArgumentParser(["--env-prefix", "ALT_"])
         parser.add_env_argument("--foo", type=str)
         parser.add_env_argument("--bar", type=str, default="default")
@@ -578,9 +518,9 @@ class TestEnvArgumentParserEdgeCases(unittest.TestCase):
 
     def test_multiple_store_true_flags(self):
         """Test multiple store_true flags with environment variables."""
-        os.environ["ODS_EXD_API_VERBOSE"] = "true"
-        os.environ["ODS_EXD_API_DEBUG"] = "1"
-        os.environ["ODS_EXD_API_QUIET"] = "false"
+        self._set_env("ODS_EXD_API_VERBOSE", "true")
+        self._set_env("ODS_EXD_API_DEBUG", "1")
+        self._set_env("ODS_EXD_API_QUIET", "false")
 
         parser = EnvArgumentParser()
         parser.add_env_argument("--verbose", action="store_true")
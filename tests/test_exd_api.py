@@ -14,6 +14,8 @@ from ods_exd_api_box import ExternalDataReader, FileHandlerRegistry, exd_api, od
 from tests.external_data_file import ExternalDataFile
 from tests.mock_servicer_context import MockServicerContext
 
+_DATA_DIR = (pathlib.Path(__file__).parent / "data").resolve()
+
 
 class TestExdApi(unittest.TestCase):
     log = logging.getLogger(__name__)
@@ -23,8 +25,7 @@ class TestExdApi(unittest.TestCase):
         FileHandlerRegistry.register(file_type_name="test", factory=ExternalDataFile.create)
 
     def _get_example_file_path(self, file_name: str) -> str:
-        example_file_path = pathlib.Path.joinpath(pathlib.Path(__file__).parent.resolve(), "data", file_name)
-        return pathlib.Path(example_file_path).absolute().resolve().as_uri()
+        return (_DATA_DIR / file_name).as_uri()
 
     def test_open(self):
         service = ExternalDataReader()
@@ -115,6 +116,44 @@ class TestExdApi(unittest.TestCase):
         finally:
             service.Close(handle, context)
 
+    def test_get_values_window(self):
+        service = ExternalDataReader()
+        context = MockServicerContext()
+        handle = service.Open(
+            exd_api.Identifier(url=self._get_example_file_path("dummy.exd_api_test"), parameters=""), context
+        )
+        try:
+            values = service.GetValues(
+                exd_api.ValuesRequest(handle=handle, group_id=0, channel_ids=[0, 1], start=1, limit=2),
+                context,
+            )
+
+            self.assertEqual(len(values.channels), 2)
+            self.assertSequenceEqual(
+                values.channels[0].values.double_array.values, [0.1480147709585864, -0.24506363109225746]
+            )
+            self.assertSequenceEqual(
+                values.channels[1].values.double_array.values, [0.6497390667439802, 0.7638782921842098]
+            )
+
+        finally:
+            service.Close(handle, context)
+
+    def test_get_values_start_out_of_range(self):
+        service = ExternalDataReader()
+        context = MockServicerContext()
+        handle = service.Open(
+            exd_api.Identifier(url=self._get_example_file_path("dummy.exd_api_test"), parameters=""), context
+        )
+        try:
+            with self.assertRaisesRegex(ValueError, "Channel start index 4 out of range"):
+                service.GetValues(
+                    exd_api.ValuesRequest(handle=handle, group_id=0, channel_ids=[0, 1], start=4, limit=2),
+                    context,
+                )
+        finally:
+            service.Close(handle, context)
+
     def test_open_not_my_file_in_open(self):
         service = ExternalDataReader()
         context = MockServicerContext()
@@ -216,6 +216,18 @@ class TestParamParserEdgeCases(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "must contain '='"):
             ParamParser.parse_params(f"B64:{outer_encoded}")
 
+    def test_repeated_calls_return_independent_results(self):
+        """Test that mutating a result does not affect later calls with the same string."""
+        first = ParamParser.parse_params('{"outer": {"inner": 1}, "key": "value"}')
+        first["key"] = "changed"
+        first["outer"]["inner"] = 2
+        second = ParamParser.parse_params('{"outer": {"inner": 1}, "key": "value"}')
+        self.assertEqual(second, {"outer": {"inner": 1}, "key": "value"})
+
+        flat = ParamParser.parse_params("key=value")
+        flat["key"] = "changed"
+        self.assertEqual(ParamParser.parse_params("key=value"), {"key": "value"})
+
     def test_only_semicolons(self):
         """Test input with only semicolons."""
         result = ParamParser.parse_params(";;;")